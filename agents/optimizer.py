@@ -0,0 +1,31 @@
+import json
+
+# Plan optimizer: sits between PlannerAgent.propose_plan and execution. Identical tasks
+# (same skill and args) run once; runs of consecutive tasks for a skill with a batch
+# implementation become one batch call. Task order across skills is kept, since later
+# skills read what earlier ones wrote (e.g. generate_npcs reads the level).
+
+def task_key(task):
+    return json.dumps([task.get("skill"), task.get("args", {})], sort_keys=True, default=str)
+
+def optimize_plan(plan, skills):
+    # steps: {"skill", "tasks": [unique tasks], "covers": [[plan indices per unique task]]}
+    steps, seen = [], {}
+    batches = getattr(skills, "batches", {})
+    for i, task in enumerate(plan.get("tasks", [])):
+        key = task_key(task)
+        if key in seen:
+            step, j = seen[key]
+            step["covers"][j].append(i)
+            continue
+        name = task.get("skill")
+        last = steps[-1] if steps else None
+        if last is not None and last["skill"] == name and name in batches:
+            step = last
+        else:
+            step = {"skill": name, "tasks": [], "covers": []}
+            steps.append(step)
+        seen[key] = (step, len(step["tasks"]))
+        step["tasks"].append(task)
+        step["covers"].append([i])
+    return steps
@@ -1,3 +1,12 @@
+import math
+
+def best_seeds(scores, width=16, height=12):
+    # seeds of completed playtested levels of this size, best first (see scripts/playtest.py)
+    ranked = sorted((s for s in scores.values()
+                     if s.get("completed") and s.get("seed") is not None and s.get("size") == [width, height]),
+                    key=lambda s: (s["score"], -s["ticks"]), reverse=True)
+    return list(dict.fromkeys(s["seed"] for s in ranked))
+
 class PlannerAgent:
     def __init__(self, bus, memory, skills, project:str):
         self.bus = bus
@@ -5,12 +14,29 @@ class PlannerAgent:
         self.skills = skills
         self.project = project
 
-    def propose_plan(self, goal:str):
-        tasks = [
-            {"skill":"design_game_outline","args":{"goal":goal, "project":self.project}},
-            {"skill":"generate_level_json","args":{"name":"meadow_v1","project":self.project}},
-            {"skill":"generate_npcs","args":{"project":self.project}},
+    def propose_plan(self, goal:str, world:bool=False, npcs:int=2, levels:int=1, scores=None):
+        level_args = {"name":"meadow_v1","project":self.project}
+        npc_args = {"project":self.project}
+        if npcs != 2:
+            npc_args["count"] = npcs
+            # ~12 cells per NPC leaves room for walls, coins and the default spacing
+            side = math.isqrt(npcs * 16) + 1
+            if side > 16:
+                level_args.update(width=side, height=max(12, side * 3 // 4))
+        level_tasks = [{"skill":"generate_level_json","args":dict(level_args, name=f"meadow_v{i}")}
+                       for i in range(2, levels + 1)]
+        level_tasks.insert(0, {"skill":"generate_level_json","args":level_args})
+        if scores:
+            # reuse the layouts that played best, in order; the rest get fresh seeds
+            seeds = best_seeds(scores, level_args.get("width", 16), level_args.get("height", 12))
+            for task, seed in zip(level_tasks, seeds):
+                task["args"]["seed"] = seed
+        tasks = [{"skill":"design_game_outline","args":{"goal":goal, "project":self.project}}] + level_tasks
+        tasks += [
+            {"skill":"generate_npcs","args":npc_args},
             {"skill":"write_dialogue","args":{"project":self.project}}
         ]
+        if world:
+            tasks.append({"skill":"generate_world_json","args":{"name":"overworld","project":self.project}})
         self.memory.add_note(f"Planned {len(tasks)} tasks toward: {goal}")
         return {"goal": goal, "tasks": tasks}
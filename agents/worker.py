@@ -1,3 +1,5 @@
+from agents.optimizer import optimize_plan
+
 class WorkerAgent:
     def __init__(self, bus, memory, skills, project:str):
         self.bus = bus
@@ -8,6 +10,46 @@ class WorkerAgent:
     def execute_task(self, task:dict):
         name = task.get("skill")
         args = task.get("args", {})
-        result = self.skills.call(name, **args)
-        self.memory.add_note(f"Executed {name}")
+        try:
+            result = self.skills.call(name, **args)
+        except Exception as e:
+            self.memory.add_note(f"Failed {name}: {type(e).__name__}: {e}")
+            raise
+        self.memory.add_note(f"Executed {name}{self._timing(name)}")
         return result
+
+    def execute_batch(self, name:str, tasks:list):
+        # one skill call and one memory note for the whole batch
+        try:
+            results = self.skills.call_batch(name, [t.get("args", {}) for t in tasks])
+        except Exception as e:
+            self.memory.add_note(f"Failed {name} x{len(tasks)}: {type(e).__name__}: {e}")
+            raise
+        self.memory.add_note(f"Executed {name} x{len(tasks)}{self._timing(name)}")
+        return results
+
+    def execute_plan(self, plan:dict):
+        # (task, result) for every planned task in plan order, duplicates included, via
+        # the optimizer; a duplicate's result is held until the tasks before it are done
+        tasks = plan.get("tasks", [])
+        done, nxt = {}, 0
+        for step in optimize_plan(plan, self.skills):
+            if len(step["tasks"]) == 1:
+                results = [self.execute_task(step["tasks"][0])]
+            else:
+                results = self.execute_batch(step["skill"], step["tasks"])
+            for result, covers in zip(results, step["covers"]):
+                for i in covers:
+                    done[i] = result
+            while nxt in done:
+                yield tasks[nxt], done.pop(nxt)
+                nxt += 1
+
+    def _timing(self, name):
+        tracer = getattr(self.skills, "tracer", None)
+        span = tracer.last() if tracer is not None else None
+        if span is not None and span.name == name:
+            if span.pending:
+                return f" ({span.wall_ms:.1f} ms, {span.pending} write(s) queued)"
+            return f" ({span.wall_ms:.1f} ms, {span.bytes} B)"
+        return ""
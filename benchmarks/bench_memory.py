@@ -0,0 +1,16 @@
+import os
+from common import measure, result, scratch_dir
+
+NOTE_COUNTS = [100, 1000, 10000]
+
+def _add_note(existing, quick):
+    from core.memory import Memory
+    with scratch_dir():
+        mem = Memory(os.path.join("data", "bench_memory.json"))
+        mem.data["notes"] = [f"Executed note {i}" for i in range(existing)]
+        sec = measure(lambda: mem.add_note("Executed generate_level_json"), number=5 if quick else 20, repeat=3)
+    return result(sec * 1e3, "ms/note", False)
+
+def benchmarks(quick=False):
+    for n in NOTE_COUNTS:
+        yield f"memory.add_note.at_{n}", lambda n=n: _add_note(n, quick)
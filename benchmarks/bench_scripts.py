@@ -0,0 +1,35 @@
+import os
+from common import measure, quiet, result, scratch_dir
+
+TREE_SIZES = [200, 2000]
+
+def _make_tree(files):
+    # a few nested packages of small text files, plus noise the scripts should skip
+    for i in range(files):
+        d = os.path.join("pkg", f"mod{i % 20}", f"sub{i % 7}")
+        os.makedirs(d, exist_ok=True)
+        with open(os.path.join(d, f"f{i}.py"), "w", encoding="utf-8") as f:
+            f.write(f"# file {i}\n" + "x = 1\n" * 40)
+    os.makedirs("__pycache__", exist_ok=True)
+    with open(os.path.join("__pycache__", "junk.pyc"), "wb") as f:
+        f.write(b"\0" * 1024)
+    os.makedirs("data", exist_ok=True)
+
+def _script_time(module, files, quick):
+    import importlib
+    mod = importlib.import_module(f"scripts.{module}")
+    with scratch_dir():
+        _make_tree(files)
+        def once():
+            with quiet():
+                mod.main()
+            for f in os.listdir("."):
+                if f.startswith("backup_") and f.endswith(".zip"):
+                    os.remove(f)
+        sec = measure(once, number=1, repeat=2 if quick else 3)
+    return result(sec * 1e3, "ms", False)
+
+def benchmarks(quick=False):
+    for n in TREE_SIZES:
+        for module in ("backup", "export_code_bundle"):
+            yield f"scripts.{module}.files_{n}", lambda m=module, n=n: _script_time(m, n, quick)
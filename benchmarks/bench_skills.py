@@ -0,0 +1,29 @@
+from common import measure, result, scratch_dir
+
+SIZES = [(16, 12), (64, 48), (256, 192)]
+
+def _level_throughput(width, height, quick):
+    from core.skills import SkillRegistry
+    skills = SkillRegistry(); skills.register_defaults()
+    number = 3 if quick else max(3, 2000 // (width * height // 192))
+    with scratch_dir():
+        sec = measure(lambda: skills.call("generate_level_json", name="bench", project="bench",
+                                          width=width, height=height), number=number, repeat=3)
+    return result(1.0 / sec, "levels/s", True)
+
+def _plan_throughput(quick):
+    from core.skills import SkillRegistry
+    skills = SkillRegistry(); skills.register_defaults()
+    def plan():
+        skills.call("design_game_outline", goal="bench", project="bench")
+        skills.call("generate_level_json", name="meadow_v1", project="bench")
+        skills.call("generate_npcs", project="bench")
+        skills.call("write_dialogue", project="bench")
+    with scratch_dir():
+        sec = measure(plan, number=5 if quick else 50, repeat=3)
+    return result(1.0 / sec, "plans/s", True)
+
+def benchmarks(quick=False):
+    for w, h in SIZES:
+        yield f"skills.generate_level_json.{w}x{h}", lambda w=w, h=h: _level_throughput(w, h, quick)
+    yield "skills.default_plan", lambda: _plan_throughput(quick)
@@ -0,0 +1,93 @@
+import os, random
+from common import measure, result, synthetic_level, synthetic_npcs
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+NPC_COUNTS = [2, 50, 500]
+COIN_COUNTS = [100, 20000]
+LEVEL_SIZES = [(16, 12), (64, 48)]
+
+def _world(width, height, npcs, coins=0):
+    from runtime.world import World
+    lvl = synthetic_level(width, height, coins=coins)
+    return World(lvl, synthetic_npcs(lvl, npcs))
+
+def _ticks_per_second(npcs, quick):
+    # one tick = the viewer's per-frame logic: player move, coin pickup, NPC updates
+    import pygame
+    pygame.init()
+    random.seed(3)
+    world = _world(64, 48, npcs, coins=200)
+    moves = [(3, 0), (0, 3), (-3, 0), (0, -3)]
+    state = {"i": 0}
+    def tick():
+        dx, dy = moves[(state["i"] // 20) % 4]
+        state["i"] += 1
+        world.move_player(dx, dy)
+        world.pickup_coins()
+        world.update_npcs()
+    ticks = 30 if quick else 300
+    sec = measure(tick, number=ticks, repeat=3)
+    return result(1.0 / sec, "ticks/s", True)
+
+def _collision_query(width, height, quick):
+    world = _world(width, height, 20)
+    rng = random.Random(5)
+    from runtime.world import rect_for_grid
+    rects = [rect_for_grid(rng.randint(1, width-2), rng.randint(1, height-2)) for _ in range(256)]
+    state = {"i": 0}
+    def query():
+        r = rects[state["i"] & 255]; state["i"] += 1
+        world.can_move(r, 1, 0)
+    sec = measure(query, number=200 if quick else 5000, repeat=3)
+    return result(sec * 1e6, "us/query", False)
+
+def _pickup_and_proximity(coins, quick):
+    # per-frame object work with the player walking over a coin-dense level
+    world = _world(256, 192, 20, coins=coins)
+    state = {"i": 0}
+    def frame():
+        i = state["i"]; state["i"] += 1
+        world.player.topleft = (32 + (i * 3) % (250 * 32), 32 + ((i // 2500) * 32) % (190 * 32))
+        world.pickup_coins()
+        world.nearest_npc(world.player)
+        world.nearest_sign(world.player)
+    sec = measure(frame, number=200 if quick else 5000, repeat=3)
+    return result(sec * 1e6, "us/frame", False)
+
+def _draw_entities(npcs, quick):
+    # the viewer's entity layers: atlas blits() batches for objects, NPCs and name labels
+    import pygame
+    pygame.init()
+    from runtime.sprites import Atlas, Labels, Layer
+    from runtime.world import TILE
+    world = _world(64, 48, npcs, coins=200)
+    screen = pygame.display.set_mode((world.w, world.h))
+    atlas, labels = Atlas(), Labels(pygame.font.SysFont(None, 20))
+    objects, bodies, names = Layer(), Layer(), Layer()
+    for obj in world.objects:
+        objects.add(atlas.surface, obj["x"]*TILE, obj["y"]*TILE, atlas.areas[obj["type"]])
+    def frame():
+        bodies.clear(); names.clear()
+        for n in world.npcs:
+            bodies.add(atlas.surface, n.rect.x, n.rect.y, atlas.npc[n.facing])
+            names.add(labels.get(n.name), n.rect.x, n.rect.y - 18)
+        objects.draw(screen); bodies.draw(screen); names.draw(screen)
+    sec = measure(frame, number=20 if quick else 300, repeat=3)
+    return result(sec * 1e6, "us/frame", False)
+
+def benchmarks(quick=False):
+    try:
+        import pygame  # noqa: F401
+    except ImportError:
+        return
+    for n in NPC_COUNTS:
+        yield f"viewer.ticks.npcs_{n}", lambda n=n: _ticks_per_second(n, quick)
+    for w, h in LEVEL_SIZES:
+        yield f"viewer.collision.{w}x{h}", lambda w=w, h=h: _collision_query(w, h, quick)
+    for c in COIN_COUNTS:
+        yield f"viewer.pickup.coins_{c}", lambda c=c: _pickup_and_proximity(c, quick)
+    for n in NPC_COUNTS:
+        yield f"viewer.draw.npcs_{n}", lambda n=n: _draw_entities(n, quick)
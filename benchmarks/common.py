@@ -0,0 +1,56 @@
+import contextlib, os, shutil, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+def measure(fn, number=1, repeat=5):
+    # best-of-`repeat` seconds per call of fn (each round runs it `number` times)
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - t0) / number)
+    return best
+
+def result(value, unit, higher_is_better):
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+@contextlib.contextmanager
+def scratch_dir():
+    # skills and scripts use cwd-relative paths; run them in a throwaway tree
+    prev = os.getcwd()
+    d = tempfile.mkdtemp(prefix="eclipsera_bench_")
+    os.chdir(d)
+    try:
+        yield d
+    finally:
+        os.chdir(prev)
+        shutil.rmtree(d, ignore_errors=True)
+
+@contextlib.contextmanager
+def quiet():
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+def synthetic_level(width, height, coins=0, seed=7):
+    import random
+    rng = random.Random(seed)
+    tiles = [["#" if x in (0, width-1) or y in (0, height-1) else "." for x in range(width)] for y in range(height)]
+    for _ in range(width * height // 12):
+        tiles[rng.randint(2, height-3)][rng.randint(2, width-3)] = "#"
+    objects = []
+    for _ in range(coins):
+        x, y = rng.randint(1, width-2), rng.randint(1, height-2)
+        if tiles[y][x] == ".":
+            objects.append({"type": "coin", "x": x, "y": y})
+    return {"name": "bench", "tiles": tiles, "player_spawn": [1, 1], "objects": objects}
+
+def synthetic_npcs(level, count, seed=11):
+    import random
+    rng = random.Random(seed)
+    tiles = level["tiles"]
+    open_cells = [(x, y) for y, row in enumerate(tiles) for x, c in enumerate(row) if c == "." and (x, y) != (1, 1)]
+    rng.shuffle(open_cells)
+    return [{"id": f"npc_{i}", "name": f"N{i}", "x": x, "y": y} for i, (x, y) in enumerate(open_cells[:count])]
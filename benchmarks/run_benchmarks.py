@@ -0,0 +1,102 @@
+# benchmarks/run_benchmarks.py
+import argparse, json, os, subprocess, sys, time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+from common import ROOT  # noqa: E402  (also puts the repo root on sys.path)
+
+MODULES = ["bench_skills", "bench_viewer", "bench_memory", "bench_scripts"]
+RESULTS_FILE = os.path.join(HERE, "results.json")
+BASELINE_FILE = os.path.join(HERE, "baseline.json")
+
+def git_revision():
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                             capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True).stdout.strip()
+        return rev + ("-dirty" if dirty else "")
+    except Exception:
+        return "unknown"
+
+def load(path, default):
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return default
+
+def save(path, obj):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+
+def run_all(selected=None, quick=False):
+    import importlib
+    out = {}
+    for modname in MODULES:
+        mod = importlib.import_module(modname)
+        for name, fn in mod.benchmarks(quick=quick):
+            if selected and not any(s in name for s in selected):
+                continue
+            t0 = time.perf_counter()
+            try:
+                out[name] = fn()
+            except Exception as e:
+                out[name] = {"error": f"{type(e).__name__}: {e}"}
+            r = out[name]
+            shown = f"{r['value']:.4g} {r['unit']}" if "value" in r else r["error"]
+            print(f"  {name:<44} {shown:<24} ({time.perf_counter()-t0:.1f}s)")
+    return out
+
+def compare(current, baseline, threshold):
+    # ratio > 1 means worse, whichever direction the metric prefers
+    regressions = []
+    for name, cur in current.items():
+        base = baseline.get(name)
+        if not base or "value" not in cur or "value" not in base or not base["value"] or not cur["value"]:
+            continue
+        if cur["higher_is_better"]:
+            ratio = base["value"] / cur["value"]
+        else:
+            ratio = cur["value"] / base["value"]
+        cur["vs_baseline"] = round(ratio, 3)
+        if ratio > 1.0 + threshold:
+            regressions.append((name, ratio, base["value"], cur["value"], cur["unit"]))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Eclipsera benchmarks")
+    parser.add_argument("-k", dest="select", action="append", help="Only run benchmarks whose name contains this (repeatable)")
+    parser.add_argument("--quick", action="store_true", help="Fewer iterations (smoke run)")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Regression threshold as a fraction (default 0.15)")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the comparison baseline")
+    parser.add_argument("--baseline", type=str, default=BASELINE_FILE, help="Baseline JSON path")
+    args = parser.parse_args()
+
+    rev = git_revision()
+    print(f"Eclipsera benchmarks @ {rev}")
+    current = run_all(args.select, quick=args.quick)
+
+    baseline = load(args.baseline, {}).get("results", {})
+    regressions = compare(current, baseline, args.threshold) if baseline else []
+
+    results = load(RESULTS_FILE, {})
+    results[rev] = {"ts": time.time(), "python": sys.version.split()[0], "quick": args.quick, "results": current}
+    save(RESULTS_FILE, results)
+    print(f"Results stored under '{rev}' in {os.path.relpath(RESULTS_FILE, ROOT)}")
+
+    if args.save_baseline:
+        save(args.baseline, {"revision": rev, "ts": time.time(), "results": current})
+        print(f"Baseline saved: {os.path.relpath(args.baseline, ROOT)}")
+    elif not baseline:
+        print("No baseline yet (run with --save-baseline).")
+
+    if regressions:
+        print(f"\n⚠ {len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for name, ratio, base, cur, unit in regressions:
+            print(f"  {name:<44} {base:.4g} -> {cur:.4g} {unit}  ({ratio:.2f}x worse)")
+        sys.exit(1)
+    elif baseline:
+        print("No regressions against baseline.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+import glob, gzip, io, json, os, threading
+from contextlib import contextmanager
+
+# Asset file I/O. Writes are streamed into a temp file next to the target, fsynced and
+# renamed over it, so readers only ever see a complete old or new asset. An asset may be
+# stored plain or compressed as <path>.gz / <path>.zst; readers find whichever exists.
+
+COMPRESSORS = {"gzip": ".gz", "zstd": ".zst"}
+SUFFIXES = ("", ".gz", ".zst")
+
+def _zstd():
+    # (module, is_stdlib)
+    try:
+        from compression import zstd  # Python 3.14+
+        return zstd, True
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError("zstd assets need Python 3.14+ or the 'zstandard' package") from None
+    return zstandard, False
+
+def resolve(path):
+    # the stored variant of an asset path (plain, .gz or .zst); the plain path if none exists
+    for suffix in SUFFIXES:
+        if os.path.exists(path + suffix):
+            return path + suffix
+    return path
+
+def exists(path):
+    return any(os.path.exists(path + s) for s in SUFFIXES)
+
+def base_path(path):
+    # asset path without a compression suffix
+    for suffix in SUFFIXES[1:]:
+        if path.endswith(suffix):
+            return path[:-len(suffix)]
+    return path
+
+def mtime(path):
+    # st_mtime_ns of the stored variant, 0 if there is none
+    try:
+        return os.stat(resolve(path)).st_mtime_ns
+    except OSError:
+        return 0
+
+def level_paths(project=None, assets_dir="assets"):
+    # generated level paths (without compression suffix) of one or every project
+    prefix = glob.escape(project) if project else "*"
+    found = set()
+    for suffix in SUFFIXES:
+        for p in glob.glob(os.path.join(glob.escape(assets_dir), f"{prefix}_level_*.json{suffix}")):
+            found.add(base_path(p))
+    return sorted(found)
+
+def decode(raw, path):
+    # bytes of a stored variant -> uncompressed bytes
+    if path.endswith(".gz"):
+        return gzip.decompress(raw)
+    if path.endswith(".zst"):
+        zstd, stdlib = _zstd()
+        if stdlib:
+            return zstd.decompress(raw)
+        return zstd.ZstdDecompressor().decompressobj().decompress(raw)
+    return raw
+
+def read_bytes(path):
+    path = resolve(path)
+    with open(path, "rb") as f:
+        return decode(f.read(), path)
+
+def read_json(path):
+    return json.loads(read_bytes(path))
+
+def open_text(path):
+    # text stream over any stored variant (for line-by-line JSONL reads)
+    path = resolve(path)
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    if path.endswith(".zst"):
+        return _zstd()[0].open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+def remove(path, keep=None):
+    # delete every stored variant of an asset except `keep`
+    for suffix in SUFFIXES:
+        p = path + suffix
+        if p != keep and os.path.exists(p):
+            os.remove(p)
+
+def _compressor(raw, compress):
+    if compress == "gzip":
+        return gzip.GzipFile(filename="", mode="wb", fileobj=raw, compresslevel=6, mtime=0)
+    if compress == "zstd":
+        zstd, stdlib = _zstd()
+        return zstd.ZstdFile(raw, "wb") if stdlib else zstd.ZstdCompressor().stream_writer(raw, closefd=False)
+    return None
+
+@contextmanager
+def atomic_open(path, compress=None, binary=False):
+    # text (or binary) stream for `path` (+ compression suffix); synced and renamed into
+    # place only on success, the temp file removed on any failure
+    final = path + COMPRESSORS[compress] if compress else path
+    os.makedirs(os.path.dirname(final) or ".", exist_ok=True)
+    tmp = f"{final}.{os.getpid()}.{threading.get_ident()}.tmp"
+    raw = open(tmp, "wb")
+    try:
+        with raw:
+            stream = _compressor(raw, compress)
+            if binary:
+                yield stream or raw
+            else:
+                text = io.TextIOWrapper(stream or raw, encoding="utf-8", newline="\n")
+                try:
+                    yield text
+                    text.flush()
+                finally:
+                    text.detach()
+            if stream is not None:
+                stream.close()
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(tmp, final)
+    except BaseException:
+        raw.close()
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    remove(path, keep=final)
+
+def _stream(obj, enc):
+    # JSON text in chunks: dicts are walked key by key, generators/iterators element by
+    # element; lists and scalars go through the C encoder in one piece
+    if isinstance(obj, dict):
+        yield "{"
+        for i, (k, v) in enumerate(obj.items()):
+            yield ("," if i else "") + enc.encode(str(k)) + ":"
+            yield from _stream(v, enc)
+        yield "}"
+    elif isinstance(obj, (str, list, tuple, int, float, bool)) or obj is None:
+        yield enc.encode(obj)
+    else:
+        yield "["
+        for i, v in enumerate(obj):
+            if i:
+                yield ","
+            yield from _stream(v, enc)
+        yield "]"
+
+def compact(obj):
+    # tile grids as one string per row; rows are produced lazily while writing
+    if isinstance(obj, dict) and isinstance(obj.get("tiles"), list):
+        tiles = obj["tiles"]
+        obj = dict(obj, tiles=(row if isinstance(row, str) else "".join(row) for row in tiles))
+    return obj
+
+def write_json(path, obj, compress=None):
+    # compact, streamed; returns the path written (with compression suffix)
+    chunks = _stream(compact(obj), json.JSONEncoder(ensure_ascii=False, separators=(",", ":")))
+    with atomic_open(path, compress) as f:
+        buf = []
+        size = 0
+        for chunk in chunks:
+            buf.append(chunk); size += len(chunk)
+            if size >= 1 << 16:
+                f.write("".join(buf)); buf.clear(); size = 0
+        f.write("".join(buf))
+    return path + COMPRESSORS[compress] if compress else path
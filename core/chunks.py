@@ -0,0 +1,47 @@
+import hashlib, random
+
+# Deterministic chunk generation for streaming worlds: a chunk depends only on
+# (world seed, cx, cy), so any chunk can be (re)built anywhere, in any order.
+
+CHUNK_SIZE = 16
+
+def chunk_seed(seed, cx, cy):
+    # stable across processes/platforms (unlike hash())
+    h = hashlib.blake2b(f"{seed}:{cx}:{cy}".encode("ascii"), digest_size=8).digest()
+    return int.from_bytes(h, "little")
+
+def generate_chunk(seed, cx, cy, size=CHUNK_SIZE):
+    rng = random.Random(chunk_seed(seed, cx, cy))
+    tiles = [["." for _ in range(size)] for _ in range(size)]
+
+    # Rocks and short wall runs
+    for _ in range(size * size // 10):
+        x, y = rng.randrange(size), rng.randrange(size)
+        dx, dy = rng.choice([(1, 0), (0, 1)])
+        for i in range(rng.randint(1, 3)):
+            if 0 <= x + dx*i < size and 0 <= y + dy*i < size:
+                tiles[y + dy*i][x + dx*i] = "#"
+
+    # Open middle row/column in every chunk: neighbouring chunks always connect
+    mid = size // 2
+    for i in range(size):
+        tiles[mid][i] = "."; tiles[i][mid] = "."
+
+    # Clear the spawn area around the world origin
+    if (cx, cy) == (0, 0):
+        for yy in range(1, 4):
+            for xx in range(1, 4):
+                tiles[yy][xx] = "."
+
+    ox, oy = cx * size, cy * size
+    objects = []
+    for _ in range(rng.randint(2, 6)):
+        x, y = rng.randrange(size), rng.randrange(size)
+        if tiles[y][x] == "." and (cx, cy, x, y) != (0, 0, 2, 2):
+            objects.append({"type": "coin", "x": ox + x, "y": oy + y})
+    if rng.random() < 0.1:
+        objects.append({"type": "sign", "x": ox + mid, "y": oy + mid,
+                        "text": f"Region {cx},{cy}. The world goes on forever."})
+
+    return {"cx": cx, "cy": cy, "size": size,
+            "tiles": ["".join(row) for row in tiles], "objects": objects}
@@ -0,0 +1,220 @@
+import json, os, queue, re, socketserver, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Long-lived generation server (python run.py --serve). Skills, per-project Memory and
+# state stay loaded between requests. Jobs for one project run strictly in order on that
+# project's queue; different projects run concurrently. Task results stream back as
+# NDJSON (one event per line) while the job runs.
+
+PROJECT_RE = re.compile(r"[A-Za-z0-9_][A-Za-z0-9_.-]{0,63}")
+
+class _ProjectQueue:
+    def __init__(self, project):
+        self.project = project
+        self.jobs = queue.Queue()
+        self.busy = False
+        self.thread = threading.Thread(target=self._run, name=f"project-{project}", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            self.busy = True
+            try:
+                job()
+            finally:
+                self.busy = False
+                self.jobs.task_done()
+
+    def pending(self):
+        return self.jobs.qsize() + (1 if self.busy else 0)
+
+class GenerationService:
+    def __init__(self, load_state, save_state, record_artifacts, log_task, trace_alloc=8):
+        from core.bus import MessageBus
+        from core.skills import SkillRegistry
+        from core.trace import Tracer
+        self._load_state = load_state
+        self._save_state = save_state
+        self._record_artifacts = record_artifacts
+        self._log_task = log_task
+        self._log_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self.bus = MessageBus()
+        # spans go to the task log only; keeping them in memory would grow forever
+        self.tracer = Tracer(sink=self.log, alloc_every=trace_alloc, keep=False)
+        self.skills = SkillRegistry(tracer=self.tracer); self.skills.register_defaults()
+        self._queues = {}
+        self._memories = {}
+        self.started = time.time()
+
+    def log(self, event):
+        with self._log_lock:
+            self._log_task(event)
+
+    def _queue(self, project):
+        with self._lock:
+            q = self._queues.get(project)
+            if q is None:
+                q = self._queues[project] = _ProjectQueue(project)
+            return q
+
+    def _memory(self, project):
+        from core.memory import Memory
+        mem = self._memories.get(project)
+        if mem is None:
+            mem = self._memories[project] = Memory(os.path.join("data", f"{project}_memory.json"))
+        return mem
+
+    def _agents(self, project):
+        from agents.planner import PlannerAgent
+        from agents.worker import WorkerAgent
+        mem = self._memory(project)
+        return (PlannerAgent(self.bus, mem, self.skills, project=project),
+                WorkerAgent(self.bus, mem, self.skills, project=project))
+
+    def status(self):
+        with self._lock:
+            queues = {p: q.pending() for p, q in self._queues.items()}
+        return {"ok": True, "uptime_s": round(time.time() - self.started, 1),
+                "skills": sorted(self.skills.skills), "queues": queues}
+
+    def submit(self, kind, project, goal):
+        # returns a Queue of events for the caller to stream; None marks the end
+        events = queue.Queue()
+        q = self._queue(project)
+        events.put({"type": "queued", "project": project, "ahead": q.pending()})
+        q.jobs.put(lambda: self._run_job(kind, project, goal, events))
+        return events
+
+    def _run_job(self, kind, project, goal, events):
+        artifacts = []
+        try:
+            planner, worker = self._agents(project)
+            plan = planner.propose_plan(goal)
+            self.log({"ts": time.time(), "type":"plan", "plan": plan})
+            events.put({"type": "plan", "plan": plan})
+            if kind == "generate":
+                for task, result in worker.execute_plan(plan):
+                    self.log({"ts": time.time(), "type":"task_result", "task": task, "result": result})
+                    artifacts.append(result)
+                    events.put({"type": "task_result", "task": task, "result": result})
+        except Exception as e:
+            events.put({"type": "error", "error": f"{type(e).__name__}: {e}"})
+        finally:
+            if artifacts:
+                # re-read so writes made since (other tools, e.g. playtest scores) survive
+                with self._state_lock:
+                    self._save_state(self._record_artifacts(self._load_state(), project, artifacts))
+            events.put({"type": "done", "project": project, "artifacts": len(artifacts)})
+            events.put(None)
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "Eclipsera/1"
+
+    def address_string(self):
+        # Unix socket peers have no (host, port)
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, fmt, *args):
+        if not self.server.quiet:
+            super().log_message(fmt, *args)
+
+    def _send_json(self, code, obj):
+        body = (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_request(self):
+        n = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(n) or b"{}") if n else {}
+        project = body.get("project", "default")
+        if not isinstance(project, str) or not PROJECT_RE.fullmatch(project):
+            raise ValueError(f"Invalid project name: {project!r}")
+        return project, body.get("goal", "Create a small top-down demo")
+
+    def do_GET(self):
+        if self.path.rstrip("/") in ("", "/health", "/status"):
+            self._send_json(200, self.server.service.status())
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        kind = self.path.strip("/")
+        if kind not in ("plan", "generate"):
+            self._send_json(404, {"error": "not found"}); return
+        try:
+            project, goal = self._read_request()
+        except Exception as e:
+            self._send_json(400, {"error": str(e)}); return
+        events = self.server.service.submit(kind, project, goal)
+        if kind == "plan":
+            # plain JSON reply with the plan (or error)
+            last = {}
+            while True:
+                ev = events.get()
+                if ev is None: break
+                if ev["type"] in ("plan", "error"): last = ev
+            self._send_json(200 if last.get("type") == "plan" else 500, last)
+            return
+        # NDJSON over chunked transfer: one event per line as tasks complete
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        try:
+            while True:
+                ev = events.get()
+                if ev is None: break
+                data = (json.dumps(ev, ensure_ascii=False) + "\n").encode("utf-8")
+                self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client went away; the job still finishes and is recorded
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        socketserver.UnixStreamServer.server_bind(self)
+        self.server_name, self.server_port = "localhost", 0
+
+def _stop_on_sigterm():
+    import signal
+    def handler(signum, frame):
+        raise KeyboardInterrupt
+    try:
+        signal.signal(signal.SIGTERM, handler)
+    except ValueError:
+        pass  # not the main thread
+
+def serve(service, host="127.0.0.1", port=8765, socket_path=None, quiet=False):
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        httpd = _UnixHTTPServer(socket_path, _Handler)
+        where = f"unix:{socket_path}"
+    else:
+        httpd = ThreadingHTTPServer((host, port), _Handler)
+        where = f"http://{host}:{httpd.server_address[1]}"
+    httpd.service = service
+    httpd.quiet = quiet
+    print(f"Eclipsera server on {where} (POST /plan, POST /generate, GET /health). Ctrl+C to stop.", flush=True)
+    _stop_on_sigterm()
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
+    return httpd
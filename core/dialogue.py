@@ -0,0 +1,180 @@
+import glob, json, os, sys, time
+from array import array
+from core import assetio
+
+# Dialogue store. Two on-disk formats:
+#   legacy  : {project}_dialogue.json, {npc_id: [{"who","text"}, ...]} (linear, loaded whole)
+#   indexed : {project}_dialogue.idx.json (speaker table + per-NPC byte offsets) and
+#             {project}_dialogue.<gen>.dlg.jsonl (one conversation per line, node tables
+#             as parallel arrays), so a conversation is read only when its NPC is near.
+#             Each write gets a new body file, so readers of the old index keep working.
+# A conversation is a graph of nodes: node i says text[i] as speakers[who[i]], then goes
+# to next[i] (-1 ends) unless choices[i] offers [[label, target], ...].
+
+FORMAT = "eclipsera-dialogue"
+VERSION = 2
+END = -1
+
+def legacy_path(project, assets_dir="assets"):
+    return os.path.join(assets_dir, f"{project}_dialogue.json")
+
+def index_path(project, assets_dir="assets"):
+    return os.path.join(assets_dir, f"{project}_dialogue.idx.json")
+
+def body_paths(project, assets_dir="assets"):
+    return glob.glob(os.path.join(glob.escape(assets_dir), f"{glob.escape(project)}_dialogue.*.dlg.jsonl"))
+
+class Conversation:
+    __slots__ = ("npc", "speakers", "who", "text", "next", "choices", "start")
+
+    def __init__(self, npc, speakers, who, text, next=None, choices=None, start=0):
+        self.npc = npc
+        self.speakers = speakers
+        self.who = array("I", who)
+        self.text = [sys.intern(t) if len(t) < 64 else t for t in text]
+        self.next = array("i", next if next is not None else list(range(1, len(text))) + [END])
+        self.choices = {int(k): v for k, v in (choices or {}).items()}
+        self.start = start
+
+    def __len__(self):
+        return len(self.text)
+
+    def speaker(self, node):
+        return self.speakers[self.who[node]]
+
+    def advance(self, node, choice=None):
+        # next node, or END; a node with choices only moves on a valid choice
+        opts = self.choices.get(node)
+        if opts:
+            if choice is None or not 0 <= choice < len(opts):
+                return node
+            return opts[choice][1]
+        nxt = self.next[node]
+        return nxt if 0 <= nxt < len(self.text) else END
+
+class DialogueStore:
+    def __init__(self, speakers=(), index=None, body=None, conversations=None):
+        self.speakers = [sys.intern(s) for s in speakers]
+        self.index = index or {}          # npc -> [offset, length, nodes] (indexed format)
+        self.body = body
+        self.loaded = dict(conversations or {})
+        self._fh = None
+
+    @classmethod
+    def open(cls, project, assets_dir="assets", loader=None):
+        idx = index_path(project, assets_dir)
+        if os.path.exists(idx):
+            return cls.open_index(idx)
+        leg = legacy_path(project, assets_dir)
+        if assetio.exists(leg):
+            return cls.from_legacy((loader or assetio.read_json)(leg))
+        return cls()
+
+    @classmethod
+    def open_index(cls, idx_path):
+        meta = _load_json(idx_path)
+        if meta.get("format") != FORMAT:
+            raise ValueError(f"Not a dialogue index: {idx_path}")
+        body = os.path.join(os.path.dirname(idx_path), meta["body"])
+        store = cls(meta["speakers"], meta["npcs"], body)
+        store._fh = open(body, "rb")  # pin this generation's body before a rewrite removes it
+        return store
+
+    @classmethod
+    def from_legacy(cls, dlg):
+        store = cls()
+        ids = {}
+        for npc, lines in dlg.items():
+            who = []
+            for ln in lines:
+                name = ln.get("who", "???")
+                if name not in ids:
+                    ids[name] = len(store.speakers); store.speakers.append(sys.intern(name))
+                who.append(ids[name])
+            store.loaded[npc] = Conversation(npc, store.speakers, who, [ln.get("text", "") for ln in lines])
+        return store
+
+    def __contains__(self, npc):
+        return npc in self.loaded or npc in self.index
+
+    def __len__(self):
+        return len(set(self.index) | set(self.loaded))
+
+    def get(self, npc):
+        conv = self.loaded.get(npc)
+        if conv is None and npc in self.index:
+            conv = self.loaded[npc] = self._read(npc)
+        return conv
+
+    def _read(self, npc):
+        offset, length = self.index[npc][:2]
+        if self._fh is None:
+            self._fh = open(self.body, "rb")
+        self._fh.seek(offset)
+        rec = json.loads(self._fh.read(length))
+        return Conversation(npc, self.speakers, rec["who"], rec["text"], rec.get("next"),
+                            rec.get("choices"), rec.get("start", 0))
+
+    def prefetch(self, npcs, keep=256):
+        # load the given NPCs' conversations; drop far-away ones beyond `keep`
+        for npc in npcs:
+            self.get(npc)
+        if self.index and len(self.loaded) > keep:
+            near = set(npcs)
+            for npc in [n for n in self.loaded if n not in near][:len(self.loaded) - keep]:
+                del self.loaded[npc]
+
+    def close(self):
+        if self._fh is not None:
+            self._fh.close(); self._fh = None
+
+def _load_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def write_indexed(project, conversations, assets_dir="assets"):
+    # conversations: iterable of (npc_id, nodes) with nodes = [{"who","text","next"?,"choices"?}]
+    # streamed one conversation at a time; returns (index path, npc count, node count)
+    os.makedirs(assets_dir, exist_ok=True)
+    idx = index_path(project, assets_dir)
+    old_bodies = body_paths(project, assets_dir)
+    body = os.path.join(assets_dir, f"{project}_dialogue.{time.time_ns():x}.dlg.jsonl")
+    speakers, ids, npcs = [], {}, {}
+    total = 0
+    with assetio.atomic_open(body, binary=True) as f:
+        for npc, nodes in conversations:
+            who, text, nxt, choices, linear = [], [], [], {}, True
+            for i, node in enumerate(nodes):
+                name = node.get("who", "???")
+                if name not in ids:
+                    ids[name] = len(speakers); speakers.append(name)
+                who.append(ids[name])
+                text.append(node.get("text", ""))
+                n = node.get("next", i + 1 if i + 1 < len(nodes) else END)
+                linear = linear and n == (i + 1 if i + 1 < len(nodes) else END)
+                nxt.append(n)
+                if node.get("choices"):
+                    choices[str(i)] = node["choices"]
+            rec = {"npc": npc, "who": who, "text": text}
+            if not linear: rec["next"] = nxt
+            if choices: rec["choices"] = choices
+            line = json.dumps(rec, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            npcs[npc] = [f.tell(), len(line), len(text)]
+            f.write(line + b"\n")
+            total += len(text)
+    meta = {"format": FORMAT, "version": VERSION, "body": os.path.basename(body),
+            "speakers": speakers, "npcs": npcs}
+    # the index is renamed in last, so readers only ever see it point at a complete body
+    with assetio.atomic_open(idx) as f:
+        json.dump(meta, f, ensure_ascii=False, separators=(",", ":"))
+    for old in old_bodies:
+        try:
+            os.remove(old)
+        except OSError:
+            pass
+    return idx, len(npcs), total
+
+def remove_indexed(project, assets_dir="assets"):
+    for p in [index_path(project, assets_dir)] + body_paths(project, assets_dir):
+        if os.path.exists(p):
+            os.remove(p)
@@ -0,0 +1,128 @@
+import json, os, random
+from core import assetio
+
+# Procedural NPC populations. NPCs go on open cells of a level (no walls, objects or
+# player spawn), at least `spacing` cells apart (Poisson-disk, checked against a bucket
+# grid), and are produced one at a time so huge populations can be streamed to JSONL.
+
+# Hand-authored cast: always first, at their usual spots when those are free
+CAST = [
+    {"id":"guide_v1","name":"Astra","role":"guide","x":6,"y":6},
+    {"id":"merchant_v1","name":"Roux","role":"merchant","x":11,"y":7},
+]
+
+ROLES = ["villager", "farmer", "guard", "merchant", "guide", "bard", "smith", "hermit"]
+NAME_HEADS = ["Ae", "Bra", "Cal", "Dor", "El", "Fen", "Gal", "Ha", "Ir", "Jo",
+              "Ka", "Lu", "Mi", "Nor", "Or", "Pe", "Qui", "Ro", "Sa", "Tam"]
+NAME_MIDS = ["", "", "ri", "la", "ven", "do", "si", "mo"]
+NAME_TAILS = ["n", "ra", "th", "wyn", "s", "ek", "lia", "do", "mir", "x"]
+EPITHETS = ["", "the Bold", "the Quiet", "of the Meadow", "the Elder", "the Swift"]
+
+JSONL_THRESHOLD = 1000  # populations above this are written as JSONL
+
+def npc_name(rng):
+    name = rng.choice(NAME_HEADS) + rng.choice(NAME_MIDS) + rng.choice(NAME_TAILS)
+    epithet = rng.choice(EPITHETS)
+    return f"{name} {epithet}" if epithet else name
+
+def open_cells(tiles, blocked=()):
+    blocked = set(blocked)
+    return [(x, y) for y, row in enumerate(tiles) for x, t in enumerate(row)
+            if t == "." and (x, y) not in blocked]
+
+class SpacingGrid:
+    # points bucketed by cell // spacing: a spacing check only looks at the 3x3 buckets around
+    def __init__(self, spacing):
+        self.spacing = max(1, spacing)
+        self.r2 = spacing * spacing
+        self.buckets = {}
+
+    def fits(self, x, y):
+        s = self.spacing
+        bx, by = x // s, y // s
+        for yy in range(by - 1, by + 2):
+            for xx in range(bx - 1, bx + 2):
+                for px, py in self.buckets.get((xx, yy), ()):
+                    if (px - x) ** 2 + (py - y) ** 2 < self.r2:
+                        return False
+        return True
+
+    def add(self, x, y):
+        self.buckets.setdefault((x // self.spacing, y // self.spacing), []).append((x, y))
+
+def place(cells, count, rng, spacing=2, grid=None):
+    # yields up to `count` cells: a partial Fisher-Yates shuffle draws each open cell at
+    # most once (no retries on walls), the grid enforces spacing; stops when cells run out
+    grid = grid or SpacingGrid(spacing)
+    cells = list(cells)
+    placed = 0
+    for i in range(len(cells)):
+        if placed >= count:
+            return
+        j = rng.randrange(i, len(cells))
+        cells[i], cells[j] = cells[j], cells[i]
+        x, y = cells[i]
+        if grid.fits(x, y):
+            grid.add(x, y)
+            placed += 1
+            yield x, y
+
+def generate(tiles, count, seed=42, spacing=2, blocked=(), cast=CAST):
+    rng = random.Random(seed)
+    cells = open_cells(tiles, blocked)
+    free = set(cells)
+    grid = SpacingGrid(spacing)
+    cast = cast[:count]
+    pending = []
+    for npc in cast:
+        if (npc["x"], npc["y"]) in free and grid.fits(npc["x"], npc["y"]):
+            grid.add(npc["x"], npc["y"])
+            free.discard((npc["x"], npc["y"]))
+            yield dict(npc)
+        else:
+            pending.append(npc)
+    cells = [c for c in cells if c in free]
+    width = len(str(max(count - len(cast), 1)))
+    for i, (x, y) in enumerate(place(cells, count - len(cast) + len(pending), rng, spacing, grid)):
+        if i < len(pending):
+            yield dict(pending[i], x=x, y=y)
+        else:
+            n = i - len(pending)
+            yield {"id": f"npc_{n:0{width}d}", "name": npc_name(rng), "role": rng.choice(ROLES), "x": x, "y": y}
+
+NPC_LEVEL = "meadow_v1"  # the level a project's NPCs stand on (as in the viewer)
+
+def npcs_path(project, assets_dir="assets"):
+    # the JSONL variant wins when both exist (the generator removes the other one)
+    jl = os.path.join(assets_dir, f"{project}_npcs.jsonl")
+    return jl if assetio.exists(jl) else os.path.join(assets_dir, f"{project}_npcs.json")
+
+def npcs_source(level_path):
+    # the project's NPC file, if this is the level they are placed on
+    project, _, level = os.path.basename(level_path)[:-len(".json")].partition("_level_")
+    return npcs_path(project, os.path.dirname(level_path)) if level == NPC_LEVEL else None
+
+def read_npcs(path):
+    # iterate NPC dicts from either variant
+    if path.endswith(".jsonl"):
+        with assetio.open_text(path) as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    elif assetio.exists(path):
+        yield from assetio.read_json(path)
+
+def count_npcs(path):
+    if path.endswith(".jsonl"):
+        with assetio.open_text(path) as f:
+            return sum(1 for line in f if line.strip())
+    return len(list(read_npcs(path)))
+
+def write_jsonl(path, npcs, compress=None):
+    # streamed through an atomic writer; returns (path written, number written)
+    n = 0
+    with assetio.atomic_open(path, compress) as f:
+        for npc in npcs:
+            f.write(json.dumps(npc, ensure_ascii=False, separators=(",", ":")) + "\n")
+            n += 1
+    return (path + assetio.COMPRESSORS[compress] if compress else path), n
@@ -0,0 +1,12 @@
+import hashlib, json
+
+# Per-call random streams for generation. Each skill call seeds its own random.Random
+# from the run seed and the task identity (skill + args), the same way core.chunks seeds
+# chunks, so output doesn't depend on call order, threads or processes and the global
+# `random` module is never touched.
+
+DEFAULT_SEED = 42
+
+def derive_seed(run_seed, *identity):
+    key = json.dumps([run_seed, *identity], sort_keys=True, separators=(",", ":"), default=str)
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
@@ -1,23 +1,58 @@
-import json, os, time, random
+import os, random, time
+from core import assetio, rng
+
+INDEXED_DIALOGUE_NPCS = 64  # above this many NPCs, write_dialogue emits the indexed format
 
 class SkillRegistry:
-    def __init__(self):
+    def __init__(self, tracer=None, compress=None, writer=None, seed=rng.DEFAULT_SEED):
         self.skills = {}
+        self.batches = {}  # name -> fn(list of kwargs) -> list of results
+        self.tracer = tracer  # core.trace.Tracer or None
+        self.compress = compress  # None, "gzip" or "zstd" for assets/
+        self.writer = writer      # core.writebehind.WriteBehind or None (synchronous writes)
+        self.seed = seed          # run seed; every call derives its own stream (core.rng)
 
-    def register(self, name, fn):
+    def register(self, name, fn, batch=None):
         self.skills[name] = fn
+        if batch is not None:
+            self.batches[name] = batch
 
     # NOTE: use skill_name to avoid clashing with task arg "name"
     def call(self, skill_name, **kwargs):
         if skill_name not in self.skills:
             raise KeyError(f"Unknown skill: {skill_name}")
-        return self.skills[skill_name](**kwargs)
+        if self.tracer is None:
+            return self.skills[skill_name](**kwargs)
+        with self.tracer.span(skill_name, kwargs):
+            return self.skills[skill_name](**kwargs)
+
+    def call_batch(self, skill_name, calls):
+        # one result per kwargs dict in `calls`, through the skill's batch fn when it has one
+        if skill_name not in self.skills:
+            raise KeyError(f"Unknown skill: {skill_name}")
+        batch = self.batches.get(skill_name)
+        if batch is None:
+            return [self.call(skill_name, **kw) for kw in calls]
+        if self.tracer is None:
+            return batch(calls)
+        # one project per batch in practice; mixed batches log their per-project counts
+        projects = {}
+        for kw in calls:
+            projects[kw.get("project")] = projects.get(kw.get("project"), 0) + 1
+        args = {"batch": len(calls), "names": [kw.get("name") for kw in calls]}
+        if len(projects) == 1:
+            args["project"] = next(iter(projects))
+        else:
+            args["projects"] = projects
+        with self.tracer.span(skill_name, args, alloc=False, calls=len(calls)):
+            return batch(calls)
 
     def register_defaults(self):
         self.register("design_game_outline", self._design_game_outline)
-        self.register("generate_level_json", self._generate_level_json)
+        self.register("generate_level_json", self._generate_level_json, batch=self._generate_levels)
         self.register("generate_npcs", self._generate_npcs)
         self.register("write_dialogue", self._write_dialogue)
+        self.register("generate_world_json", self._generate_world_json)
 
     # --- Basic skills ---
 
@@ -33,12 +68,18 @@ class SkillRegistry:
             "levels": ["meadow_v1"],
             "npcs": ["guide_v1","merchant_v1"]
         }
-        self._write_json(f"data/{project}_outline.json", outline)
+        self._write_json(f"data/{project}_outline.json", outline, compressible=False)
         return {"type":"outline", "path": f"data/{project}_outline.json", "summary":"Game outline created."}
 
-    def _generate_level_json(self, name:str, project:str):
-        import random
-        W, H = 16, 12
+    def _generate_level_json(self, name:str, project:str, width:int=16, height:int=12, seed:int=None):
+        # an explicit seed reproduces a level layout (e.g. one that playtested well) in any project
+        if seed is None:
+            seed = rng.derive_seed(self.seed, "generate_level_json",
+                                   {"name": name, "project": project, "width": width, "height": height})
+        rnd = random.Random(seed)
+        W, H = width, height
+        # wall/coin counts scale with area; the default 16x12 keeps 18 walls / 8 coins
+        area_scale = (W * H) / (16 * 12)
         tiles = [["." for _ in range(W)] for _ in range(H)]
 
         # Solid border
@@ -48,10 +89,9 @@ class SkillRegistry:
             tiles[y][0] = "#"; tiles[y][W-1] = "#"
 
         # Random interior walls
-        random.seed(42)
-        for _ in range(18):
-            x = random.randint(2, W-3)
-            y = random.randint(2, H-3)
+        for _ in range(max(1, round(18 * area_scale))):
+            x = rnd.randint(2, W-3)
+            y = rnd.randint(2, H-3)
             tiles[y][x] = "#"
 
         # Guaranteed center cross corridors
@@ -69,33 +109,64 @@ class SkillRegistry:
         placed = set()
         def is_open(x,y): return tiles[y][x] == "." and (x,y) not in placed and (x,y) != tuple(spawn)
         coins = []
-        for _ in range(8):
+        for _ in range(max(1, round(8 * area_scale))):
             for _try in range(50):
-                x, y = random.randint(1, W-2), random.randint(1, H-2)
+                x, y = rnd.randint(1, W-2), rnd.randint(1, H-2)
                 if is_open(x,y):
                     coins.append({"type":"coin","x":x,"y":y})
                     placed.add((x,y)); break
 
         objects = coins + [
-            {"type":"sign","x":8,"y":3,"text":"Collect all coins, then ESC to quit."}
+            {"type":"sign","x":min(8, W-2),"y":min(3, H-2),"text":"Collect all coins, then ESC to quit."}
         ]
 
-        level = {"name": name, "tiles": tiles, "player_spawn": spawn, "objects": objects}
-        p = f"assets/{project}_level_{name}.json"
-        self._write_json(p, level)
+        level = {"name": name, "seed": seed, "tiles": tiles, "player_spawn": spawn, "objects": objects}
+        p = self._write_json(f"assets/{project}_level_{name}.json", level)
         return {"type":"level", "path": p, "summary": f"Level {name} with coins/signs generated."}
 
 
-    def _generate_npcs(self, project:str):
-        npcs = [
-            {"id":"guide_v1","name":"Astra","role":"guide","x":6,"y":6},
-            {"id":"merchant_v1","name":"Roux","role":"merchant","x":11,"y":7}
-        ]
-        p = f"assets/{project}_npcs.json"
-        self._write_json(p, npcs)
-        return {"type":"npcs", "path": p, "summary": "Basic NPCs created."}
+    def _generate_levels(self, calls):
+        # many levels under one span / memory note / log flush instead of one per level
+        return [self._generate_level_json(**kw) for kw in calls]
+
+    def _generate_world_json(self, name:str, project:str, seed:int=None, chunk_size:int=16):
+        # streaming worlds store only a manifest; chunks come from core.chunks on demand
+        if seed is None:
+            seed = rng.derive_seed(self.seed, "generate_world_json", {"name": name, "project": project})
+        spawn = [2, 2]  # core.chunks keeps this corner of chunk (0, 0) open
+        world = {"name": name, "seed": seed, "chunk_size": chunk_size, "player_spawn": spawn}
+        p = self._write_json(f"assets/{project}_world.json", world)
+        return {"type":"world", "path": p, "summary": f"Streaming world {name} (seed {seed}) created."}
 
-    def _write_dialogue(self, project:str):
+    def _generate_npcs(self, project:str, count:int=2, level:str="meadow_v1", spacing:int=2, seed:int=None):
+        from core import npcgen
+        lp = f"assets/{project}_level_{level}.json"
+        self._sync(lp)
+        if not assetio.exists(lp):
+            raise FileNotFoundError(f"{lp} not found; run generate_level_json first")
+        lvl = assetio.read_json(lp)
+        blocked = [(o["x"], o["y"]) for o in lvl.get("objects", [])] + [tuple(lvl["player_spawn"])]
+        if seed is None:
+            seed = rng.derive_seed(self.seed, "generate_npcs",
+                                   {"project": project, "count": count, "level": level, "spacing": spacing})
+        npcs = npcgen.generate(lvl["tiles"], count, seed=seed, spacing=spacing, blocked=blocked)
+        # large populations are streamed as JSONL; only one variant is kept on disk
+        p, other = f"assets/{project}_npcs.json", f"assets/{project}_npcs.jsonl"
+        if count > npcgen.JSONL_THRESHOLD:
+            p, other = other, p
+            p, n = npcgen.write_jsonl(p, npcs, compress=self.compress)
+            if self.tracer is not None:
+                self.tracer.add_bytes(os.path.getsize(p))
+        else:
+            npcs = list(npcs)
+            n = len(npcs)
+            p = self._write_json(p, npcs)
+        self._sync(other)
+        assetio.remove(other)
+        short = f" (level has room for {n})" if n < count else ""
+        return {"type":"npcs", "path": p, "summary": f"{n} NPCs placed{short}."}
+
+    def _write_dialogue(self, project:str, fmt:str="auto"):
         dlg = {
             "guide_v1":[
                 {"who":"Astra","text":"Welcome to Eclipsera!"},
@@ -106,11 +177,94 @@ class SkillRegistry:
                 {"who":"Roux","text":"I trade tips for coins… when we add inventory 😉"}
             ]
         }
-        p = f"assets/{project}_dialogue.json"
-        self._write_json(p, dlg)
-        return {"type":"dialogue","path":p,"summary":"Dialogue written."}
-
-    def _write_json(self, path, obj):
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(obj, f, indent=2, ensure_ascii=False)
+        from core import dialogue
+        if fmt == "auto":
+            from core.npcgen import count_npcs, npcs_path
+            self._sync(f"assets/{project}_npcs.json")
+            p = npcs_path(project)
+            fmt = "indexed" if assetio.exists(p) and count_npcs(p) > INDEXED_DIALOGUE_NPCS else "json"
+        if fmt != "indexed":
+            dialogue.remove_indexed(project)
+            p = self._write_json(f"assets/{project}_dialogue.json", dlg)
+            return {"type":"dialogue","path":p,"summary":"Dialogue written."}
+
+        # indexed: streamed per NPC, with templated branching talks for generated NPCs
+        def conversations():
+            guide = dlg["guide_v1"] + [
+                {"who":"Astra","text":"Anything else?",
+                 "choices":[["Where are the coins?", 4], ["Bye.", 5]]},
+                {"who":"Astra","text":"Scattered around the meadow. Check near the walls.", "next":-1},
+                {"who":"Astra","text":"Safe travels!", "next":-1},
+            ]
+            yield "guide_v1", guide
+            yield "merchant_v1", dlg["merchant_v1"]
+            for npc in self._read_npcs(project):
+                if npc["id"] not in dlg:
+                    yield npc["id"], _templated_dialogue(npc)
+        self._sync(f"assets/{project}_npcs.json", f"assets/{project}_dialogue.json")
+        p, n_npcs, n_lines = dialogue.write_indexed(project, conversations())
+        assetio.remove(f"assets/{project}_dialogue.json")
+        if self.tracer is not None:
+            self.tracer.add_bytes(os.path.getsize(p) + sum(os.path.getsize(b) for b in dialogue.body_paths(project)))
+        return {"type":"dialogue","path":p,"summary":f"Indexed dialogue written ({n_npcs} NPCs, {n_lines} lines)."}
+
+    def _read_npcs(self, project):
+        from core import npcgen
+        return npcgen.read_npcs(npcgen.npcs_path(project))
+
+    def _write_json(self, path, obj, compressible=True):
+        # compact, streamed and atomic (core.assetio); returns the path actually written.
+        # With a writer, `obj` is handed off as-is and persisted in the background.
+        compress = self.compress if compressible else None
+        if self.writer is None:
+            p = assetio.write_json(path, obj, compress=compress)
+            if self.tracer is not None:
+                self.tracer.add_bytes(os.path.getsize(p))
+            return p
+        # the span is logged once its queued writes are done, bytes included
+        tracer = self.tracer
+        span = tracer.current() if tracer is not None else None
+        if span is not None:
+            tracer.hold(span)
+        def write():
+            try:
+                p = assetio.write_json(path, obj, compress=compress)
+                n = os.path.getsize(p)
+            except Exception as e:
+                if span is not None:
+                    tracer.release(span, error=e)
+                raise
+            if span is not None:
+                tracer.release(span, n)
+            return p
+        self.writer.submit(path, write)
+        return path + assetio.COMPRESSORS[compress] if compress else path
+
+    def _sync(self, *paths):
+        # wait for queued writes of these paths before reading or removing them
+        if self.writer is not None:
+            for p in paths:
+                self.writer.wait(p)
+
+    def flush(self):
+        # persist every queued write; raises core.writebehind.DeferredWriteError
+        if self.writer is not None:
+            self.writer.flush()
+
+_ROLE_LINES = {
+    "guide":    ["The paths here shift with every season.", "Stick to the open corridors."],
+    "merchant": ["Fine wares, finer prices.", "Come back when you have coins to spare."],
+}
+_DEFAULT_LINES = ["Lovely day in Eclipsera.", "Have you met the guide yet?"]
+
+def _templated_dialogue(npc):
+    name = npc.get("name", npc["id"])
+    role = npc.get("role", "villager")
+    lines = _ROLE_LINES.get(role, _DEFAULT_LINES)
+    return [
+        {"who": name, "text": f"Hello, I'm {name}, the {role}."},
+        {"who": name, "text": lines[0],
+         "choices": [["Tell me more.", 2], ["Goodbye.", 3]]},
+        {"who": name, "text": lines[1], "next": -1},
+        {"who": name, "text": "Until next time.", "next": -1},
+    ]
@@ -0,0 +1,190 @@
+import json, os, threading, time
+
+# Per-call skill instrumentation. Each span records wall/CPU time, bytes written,
+# peak allocation (tracemalloc, sampled) and outcome; finished spans go to `sink`
+# (e.g. run.log_task) and are kept for an optional Chrome trace-event dump. A span with
+# writes still queued (core.writebehind) reaches the sink once they finish. Sampled
+# spans carry tracemalloc's overhead in their times, so they are marked and left out
+# of the timing totals.
+
+class Span:
+    def __init__(self, name, args, calls=1):
+        self.name = name
+        self.args = args
+        self.calls = calls   # skill calls covered (a batch span covers many)
+        self.bytes = 0
+        self.writes = 0
+        self.ok = True
+        self.error = None
+        self.peak_kb = None
+        self.sampled = False
+        self.pending = 0   # queued writes not credited yet (hold/release)
+        self.closed = False
+        self.start = time.time()
+        self.wall_ms = 0.0
+        self.cpu_ms = 0.0
+        self.tid = threading.get_ident()
+
+    def event(self):
+        return {
+            "ts": self.start, "type": "span", "skill": self.name,
+            "project": self.args.get("project"), "args": self.args, "calls": self.calls,
+            "wall_ms": round(self.wall_ms, 3), "cpu_ms": round(self.cpu_ms, 3),
+            "bytes": self.bytes, "writes": self.writes, "peak_kb": self.peak_kb,
+            "sampled": self.sampled, "ok": self.ok, "error": self.error,
+        }
+
+# tracemalloc is process-wide: sampled spans take turns (e.g. concurrent jobs under
+# --serve), so one span's reset_peak()/stop() can't clobber another's reading
+_alloc_lock = threading.RLock()
+
+class _SpanContext:
+    def __init__(self, tracer, span, sample):
+        self.tracer = tracer
+        self.span = span
+        self.sample = sample
+        self._started_tm = False
+
+    def __enter__(self):
+        if self.sample:
+            import tracemalloc
+            _alloc_lock.acquire()
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(); self._started_tm = True
+            tracemalloc.reset_peak()
+            self._tm_base = tracemalloc.get_traced_memory()[0]
+        self.tracer._stack().append(self.span)
+        self._t0 = time.perf_counter()
+        self._c0 = time.thread_time()
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        s = self.span
+        s.wall_ms = (time.perf_counter() - self._t0) * 1000.0
+        s.cpu_ms = (time.thread_time() - self._c0) * 1000.0
+        if self.sample:
+            import tracemalloc
+            # approximate when other threads allocate concurrently
+            peak = tracemalloc.get_traced_memory()[1]
+            s.peak_kb = round(max(0, peak - self._tm_base) / 1024.0, 1)
+            if self._started_tm:
+                tracemalloc.stop()
+            _alloc_lock.release()
+        if exc is not None:
+            s.ok = False
+            s.error = f"{exc_type.__name__}: {exc}"
+        self.tracer._stack().pop()
+        self.tracer._finish(s)
+        return False
+
+class Tracer:
+    def __init__(self, sink=None, alloc_every=8, keep=True):
+        self.sink = sink
+        self.alloc_every = alloc_every  # 0 disables tracemalloc sampling
+        self.keep = keep
+        self.spans = []
+        self._counts = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._t_origin = time.time()
+
+    def _stack(self):
+        st = getattr(self._local, "stack", None)
+        if st is None:
+            st = self._local.stack = []
+        return st
+
+    def current(self):
+        st = self._stack()
+        return st[-1] if st else None
+
+    def last(self):
+        return getattr(self._local, "last", None)
+
+    def span(self, name, args=None, alloc=True, calls=1):
+        with self._lock:
+            n = self._counts.get(name, 0)
+            self._counts[name] = n + 1
+        # every Nth call of each skill is sampled, never the first: a one-shot run keeps
+        # clean timings (alloc=False: never, e.g. for long batch calls)
+        sample = alloc and bool(self.alloc_every) and (n + 1) % self.alloc_every == 0
+        span = Span(name, dict(args or {}), calls)
+        span.sampled = sample
+        return _SpanContext(self, span, sample)
+
+    def add_bytes(self, n, span=None):
+        # span: credit a write finished elsewhere (e.g. a write-behind thread) to that span
+        s = span or self.current()
+        if s is not None:
+            with self._lock:
+                s.bytes += n
+                s.writes += 1
+
+    def hold(self, span):
+        # a write for `span` was queued: its event waits for the matching release()
+        with self._lock:
+            span.pending += 1
+
+    def release(self, span, n=None, error=None):
+        # the queued write finished: n bytes written, or the exception it failed with
+        with self._lock:
+            if error is not None:
+                if span.ok:
+                    span.ok = False
+                    span.error = f"{type(error).__name__}: {error}"
+            elif n is not None:
+                span.bytes += n
+                span.writes += 1
+            span.pending -= 1
+            emit = span.closed and not span.pending
+        if emit:
+            self._emit(span)
+
+    def _finish(self, span):
+        self._local.last = span
+        with self._lock:
+            if self.keep:
+                self.spans.append(span)
+            span.closed = True
+            emit = not span.pending
+        if emit:
+            self._emit(span)
+
+    def _emit(self, span):
+        if self.sink is not None:
+            self.sink(span.event())
+
+    def summary(self):
+        # per-skill totals, slowest first
+        agg = {}
+        with self._lock:
+            spans = list(self.spans)
+        for s in spans:
+            a = agg.setdefault(s.name, {"calls": 0, "sampled": 0, "wall_ms": 0.0, "cpu_ms": 0.0,
+                                        "bytes": 0, "errors": 0})
+            a["calls"] += s.calls; a["bytes"] += s.bytes; a["errors"] += 0 if s.ok else 1
+            if s.sampled:
+                a["sampled"] += 1  # times inflated by tracemalloc
+            else:
+                a["wall_ms"] += s.wall_ms; a["cpu_ms"] += s.cpu_ms
+        return dict(sorted(agg.items(), key=lambda kv: -kv[1]["wall_ms"]))
+
+    def write_chrome_trace(self, path):
+        # chrome://tracing / Perfetto "X" (complete) events, microsecond timestamps
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self.spans)
+        events = []
+        for s in spans:
+            ev = s.event()
+            events.append({
+                "name": s.name, "cat": "skill", "ph": "X", "pid": pid, "tid": s.tid,
+                "ts": (s.start - self._t_origin) * 1e6, "dur": s.wall_ms * 1000.0,
+                "args": {k: ev[k] for k in ("calls", "cpu_ms", "bytes", "writes", "peak_kb", "sampled", "ok", "error", "args")},
+            })
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+        return path
@@ -0,0 +1,74 @@
+import queue, threading, zlib
+
+# Write-behind queue for skill outputs: skills hand over finished objects and go back to
+# generating while writer threads serialize and persist them. Writes to one path always
+# go to the same writer, so they land in submission order. Queues are bounded: a skill
+# that outruns the disk blocks in submit() instead of buffering without limit. Errors
+# are kept and raised from flush().
+
+class DeferredWriteError(RuntimeError):
+    def __init__(self, errors):
+        self.errors = errors  # [(path, exception)]
+        path, e = errors[0]
+        more = f" (+{len(errors) - 1} more)" if len(errors) > 1 else ""
+        super().__init__(f"Deferred write failed: {path}: {type(e).__name__}: {e}{more}")
+
+class WriteBehind:
+    def __init__(self, workers=2, max_pending=64):
+        workers = max(1, workers)
+        self._queues = [queue.Queue(max(1, max_pending // workers)) for _ in range(workers)]
+        self._pending = {}   # path -> queued writes not finished yet
+        self._cond = threading.Condition()
+        self._errors = []
+        self._threads = [threading.Thread(target=self._run, args=(q,), name=f"write-behind-{i}", daemon=True)
+                         for i, q in enumerate(self._queues)]
+        for t in self._threads:
+            t.start()
+
+    def submit(self, path, write):
+        # write() runs on a writer thread
+        with self._cond:
+            self._pending[path] = self._pending.get(path, 0) + 1
+        self._queues[zlib.crc32(path.encode("utf-8")) % len(self._queues)].put((path, write))
+
+    def _run(self, q):
+        while True:
+            item = q.get()
+            if item is None:
+                q.task_done()
+                return
+            path, write = item
+            try:
+                write()
+            except Exception as e:
+                with self._cond:
+                    self._errors.append((path, e))
+            finally:
+                with self._cond:
+                    self._pending[path] -= 1
+                    if not self._pending[path]:
+                        del self._pending[path]
+                    self._cond.notify_all()
+                q.task_done()
+
+    def wait(self, path):
+        # block until every queued write of `path` is on disk (read-after-write)
+        with self._cond:
+            self._cond.wait_for(lambda: path not in self._pending)
+
+    def flush(self):
+        for q in self._queues:
+            q.join()
+        with self._cond:
+            errors, self._errors = self._errors, []
+        if errors:
+            raise DeferredWriteError(errors)
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            for q in self._queues:
+                q.put(None)
+            for t in self._threads:
+                t.join()
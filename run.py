@@ -1,17 +1,14 @@
-import argparse, json, os, sys, time, subprocess
-from core.bus import MessageBus
-from core.memory import Memory
-from core.skills import SkillRegistry
-from agents.planner import PlannerAgent
-from agents.worker import WorkerAgent
+import json, os, threading, time
+# Heavier modules (argparse, skills, agents, viewer, scripts) are imported where they
+# are first needed: automation calls run.py thousands of times.
 
 DATA_DIR = "data"
 STATE_FILE = os.path.join(DATA_DIR, "state.json")
 LOG_FILE = os.path.join(DATA_DIR, "task_log.jsonl")
 
 def ensure_dirs():
-    for d in ["core","agents","runtime","skills","assets","data","scripts"]:
-        os.makedirs(d, exist_ok=True)
+    # skills and Memory create assets/ and data/ themselves when they write
+    os.makedirs(DATA_DIR, exist_ok=True)
 
 def load_state():
     if os.path.exists(STATE_FILE):
@@ -24,58 +21,155 @@ def save_state(state):
     with open(STATE_FILE,"w",encoding="utf-8") as f:
         json.dump(state, f, indent=2, ensure_ascii=False)
 
+def record_artifacts(state, project, artifacts):
+    state["current_project"] = project
+    proj = state["projects"].setdefault(project, {"created": time.time(), "notes": ""})
+    # one entry per artifact path: reruns overwrite the same files, so keep the latest result
+    merged = {a.get("path"): a for a in proj.get("artifacts", [])}
+    for a in artifacts:
+        merged.pop(a.get("path"), None)
+        merged[a.get("path")] = a
+    proj["artifacts"] = list(merged.values())
+    return state
+
+def update_state(project, artifacts):
+    # state is only read once generation is done, then written back once
+    state = record_artifacts(load_state(), project, artifacts)
+    save_state(state)
+    return state
+
+_log_file = None
+_log_lock = threading.Lock()  # spans with queued writes are logged from writer threads
+
 def log_task(event):
-    with open(LOG_FILE,"a",encoding="utf-8") as f:
-        f.write(json.dumps(event, ensure_ascii=False) + "\n")
+    # one line-buffered append handle per process instead of an open/close per event
+    global _log_file
+    line = json.dumps(event, ensure_ascii=False) + "\n"
+    with _log_lock:
+        if _log_file is None:
+            ensure_dirs()
+            _log_file = open(LOG_FILE, "a", encoding="utf-8", buffering=1)
+        _log_file.write(line)
 
-def maybe_autobackup(do_backup: bool):
-    if not do_backup:
-        return
+def autobackup():
     try:
+        from scripts import export_handoff, backup
         # HANDOFF first
-        subprocess.run([sys.executable, os.path.join("scripts","export_handoff.py")], check=False)
+        export_handoff.main()
         # then ZIP
-        subprocess.run([sys.executable, os.path.join("scripts","backup.py")], check=False)
+        backup.main()
         print("Auto-backup complete (handoff + zip).")
     except Exception as e:
         print("Auto-backup failed:", e)
 
+def maybe_autobackup(do_backup: bool, background: bool = False):
+    # in-process; with background=True it overlaps whatever runs next (e.g. the viewer)
+    # and the interpreter waits for it before exiting
+    if not do_backup:
+        return None
+    if not background:
+        autobackup()
+        return None
+    t = threading.Thread(target=autobackup, name="autobackup")
+    t.start()
+    return t
+
 def main():
-    ensure_dirs()
+    import argparse
     parser = argparse.ArgumentParser(description="Eclipsera runner")
     parser.add_argument("--goal", type=str, default="Create a small top-down demo",
                         help="High-level creation goal")
     parser.add_argument("--project", type=str, default="default", help="Project name")
     parser.add_argument("--viewer", action="store_true", help="Launch the viewer after generation")
+    parser.add_argument("--frame-budget", type=float, default=None, metavar="MS",
+                        help="Viewer frame-time budget; over it, NPCs update less often instead of frames dropping")
+    parser.add_argument("--stream", action="store_true",
+                        help="Also generate a streaming world; with --viewer, explore it instead of the level")
+    parser.add_argument("--npcs", type=int, default=2, metavar="N",
+                        help="NPC population to place (the level grows to fit large populations)")
+    parser.add_argument("--levels", type=int, default=1, metavar="N",
+                        help="Generate N levels (meadow_v1..meadow_vN; the viewer opens meadow_v1)")
+    parser.add_argument("--seed", type=int, default=42,
+                        help="Run seed; each task derives its own random stream from it")
+    parser.add_argument("--best-seeds", action="store_true",
+                        help="Build levels from the best playtested level seeds first (scripts/playtest.py)")
+    parser.add_argument("--writers", type=int, default=4, metavar="N",
+                        help="Background asset writer threads (0 = write synchronously)")
+    parser.add_argument("--compress", choices=["gzip", "zstd"], default=None,
+                        help="Store generated assets compressed (.gz/.zst); the viewer reads either")
     parser.add_argument("--autobackup", action="store_true", help="Export HANDOFF and create backup.zip after run")
+    parser.add_argument("--trace", type=str, default=None, metavar="PATH",
+                        help="Also write skill spans as a Chrome trace-event JSON file")
+    parser.add_argument("--trace-alloc", type=int, default=8, metavar="N",
+                        help="Sample peak allocation (tracemalloc) on every Nth call per skill, never the first; 0 disables")
+    parser.add_argument("--serve", action="store_true",
+                        help="Run as a long-lived generation server instead of a single generation")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Server bind address (--serve)")
+    parser.add_argument("--port", type=int, default=8765, help="Server port (--serve)")
+    parser.add_argument("--socket", type=str, default=None, metavar="PATH",
+                        help="Serve on a Unix socket instead of TCP (--serve)")
     args = parser.parse_args()
 
-    state = load_state()
-    state["current_project"] = args.project
-    if args.project not in state["projects"]:
-        state["projects"][args.project] = {"created": time.time(), "notes": ""}
+    if args.serve:
+        from core.daemon import GenerationService, serve
+        service = GenerationService(load_state, save_state, record_artifacts, log_task,
+                                    trace_alloc=args.trace_alloc)
+        serve(service, host=args.host, port=args.port, socket_path=args.socket)
+        return
+
+    from core.bus import MessageBus
+    from core.memory import Memory
+    from core.skills import SkillRegistry
+    from core.trace import Tracer
+    from core.writebehind import WriteBehind
+    from agents.planner import PlannerAgent
+    from agents.worker import WorkerAgent
 
     bus = MessageBus()
     mem = Memory(os.path.join("data", f"{args.project}_memory.json"))
-    skills = SkillRegistry(); skills.register_defaults()
+    tracer = Tracer(sink=log_task, alloc_every=args.trace_alloc)
+    writer = WriteBehind(workers=args.writers) if args.writers > 0 else None
+    skills = SkillRegistry(tracer=tracer, compress=args.compress, writer=writer, seed=args.seed)
+    skills.register_defaults()
     planner = PlannerAgent(bus, mem, skills, project=args.project)
     worker  = WorkerAgent(bus, mem, skills, project=args.project)
 
-    plan = planner.propose_plan(args.goal)
+    scores = load_state().get("playtest") if args.best_seeds else None
+    plan = planner.propose_plan(args.goal, world=args.stream, npcs=args.npcs, levels=args.levels, scores=scores)
     log_task({"ts": time.time(), "type":"plan", "plan": plan})
-    for task in plan.get("tasks", []):
-        result = worker.execute_task(task)
-        log_task({"ts": time.time(), "type":"task_result", "task": task, "result": result})
-        state["projects"][args.project].setdefault("artifacts", []).append(result)
+    artifacts = []
+    try:
+        for task, result in worker.execute_plan(plan):
+            log_task({"ts": time.time(), "type":"task_result", "task": task, "result": result})
+            artifacts.append(result)
+    finally:
+        # queued asset writes land (or raise) before state records them
+        try:
+            skills.flush()
+        finally:
+            if writer is not None:
+                writer.close()
 
-    save_state(state)
+    update_state(args.project, artifacts)
     print("Generation done. See data/task_log.jsonl and assets/.")
+    for name, t in tracer.summary().items():
+        print(f"  {name:<22} {t['calls']:>4} calls {t['wall_ms']:>9.1f} ms wall {t['cpu_ms']:>9.1f} ms cpu {t['bytes']:>10} B"
+              + (f" ({t['sampled']} alloc-sampled, not timed)" if t["sampled"] else ""))
+    if args.trace:
+        print("Trace written:", tracer.write_chrome_trace(args.trace))
+
+    # with the viewer up, handoff + zip run alongside it instead of after it closes
+    backup_thread = maybe_autobackup(args.autobackup, background=args.viewer)
 
-    if args.viewer:
+    if args.viewer and args.stream:
+        from runtime.streaming import run_stream_viewer
+        run_stream_viewer(args.project)
+    elif args.viewer:
         from runtime.viewer import run_viewer
-        run_viewer(args.project)
+        run_viewer(args.project, frame_budget_ms=args.frame_budget)
 
-    maybe_autobackup(args.autobackup)
+    if backup_thread is not None:
+        backup_thread.join()
     print("Tip: manual handoff -> python scripts/export_handoff.py | manual backup -> python scripts/backup.py")
 
 if __name__ == "__main__":
@@ -0,0 +1,119 @@
+import hashlib, json, os, pickle, threading
+from core import assetio
+
+# Compiled asset cache, like .pyc for generated game data: each JSON asset gets a
+# pickle sidecar in CACHE_DIR holding the source's (mtime_ns, size, sha1) and the parsed
+# value. A fresh sidecar is used as-is; a stale one is rebuilt from the source.
+# Assets stored compressed (core.assetio: .gz/.zst) are found and decoded transparently.
+
+CACHE_DIR = os.path.join("data", ".asset_cache")
+CACHE_VERSION = 1
+
+def cache_path(path, cache_dir=CACHE_DIR):
+    key = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:24]
+    return os.path.join(cache_dir, f"{os.path.basename(path)}.{key}.pickle")
+
+def parse_asset(raw, path=""):
+    raw = assetio.decode(raw, path)
+    if assetio.base_path(path).endswith(".jsonl"):
+        return [json.loads(line) for line in raw.splitlines() if line.strip()]
+    return json.loads(raw)
+
+def _read_cache(cp):
+    # (header, file) with the file positioned at the payload, or (None, None)
+    try:
+        f = open(cp, "rb")
+    except OSError:
+        return None, None
+    try:
+        header = pickle.load(f)
+        if isinstance(header, dict) and header.get("version") == CACHE_VERSION:
+            return header, f
+    except Exception:
+        pass
+    f.close()
+    return None, None
+
+def _write_cache(cp, header, data):
+    try:
+        os.makedirs(os.path.dirname(cp), exist_ok=True)
+        tmp = f"{cp}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cp)
+    except OSError:
+        pass  # read-only checkout etc.: the cache is only an accelerator
+
+def _header(path, st, digest):
+    return {"version": CACHE_VERSION, "source": path, "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size, "sha1": digest}
+
+def load_asset(path, cache_dir=CACHE_DIR):
+    path = assetio.resolve(path)
+    st = os.stat(path)
+    cp = cache_path(path, cache_dir)
+    header, f = _read_cache(cp)
+    raw = None
+    if f is not None:
+        with f:
+            try:
+                if (header["mtime_ns"], header["size"]) == (st.st_mtime_ns, st.st_size):
+                    return pickle.load(f)
+                if header["size"] == st.st_size:
+                    # touched but maybe unchanged: same hash -> reuse payload, restamp
+                    with open(path, "rb") as src:
+                        raw = src.read()
+                    if hashlib.sha1(raw).hexdigest() == header["sha1"]:
+                        data = pickle.load(f)
+                        _write_cache(cp, _header(path, st, header["sha1"]), data)
+                        return data
+            except Exception:
+                pass
+    if raw is None:
+        with open(path, "rb") as src:
+            raw = src.read()
+    data = parse_asset(raw, path)
+    _write_cache(cp, _header(path, st, hashlib.sha1(raw).hexdigest()), data)
+    return data
+
+def is_fresh(path, cache_dir=CACHE_DIR):
+    path = assetio.resolve(path)
+    st = os.stat(path)
+    header, f = _read_cache(cache_path(path, cache_dir))
+    if f is None:
+        return False
+    f.close()
+    if (header["mtime_ns"], header["size"]) == (st.st_mtime_ns, st.st_size):
+        return True
+    # touched but unchanged content: same hash is still fresh (restamped on next load)
+    if header["size"] == st.st_size:
+        with open(path, "rb") as src:
+            return hashlib.sha1(src.read()).hexdigest() == header["sha1"]
+    return False
+
+def project_assets(project=None, assets_dir="assets"):
+    if not os.path.isdir(assets_dir):
+        return []
+    prefix = f"{project}_" if project else ""
+    return sorted(os.path.join(assets_dir, f) for f in os.listdir(assets_dir)
+                  if f.startswith(prefix) and assetio.base_path(f).endswith((".json", "_npcs.jsonl")))
+
+def _compile(path):
+    if is_fresh(path):
+        return path, False
+    load_asset(path)
+    return path, True
+
+def prewarm(paths, workers=None):
+    # compile every asset in parallel; returns (compiled, already_fresh)
+    paths = list(paths)
+    if not paths:
+        return [], []
+    if len(paths) == 1 or workers == 1:
+        results = [_compile(p) for p in paths]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            results = list(ex.map(_compile, paths, chunksize=max(1, len(paths) // 32)))
+    return [p for p, c in results if c], [p for p, c in results if not c]
@@ -0,0 +1,65 @@
+import os, queue, threading
+from runtime.world import diff_tiles
+from core.assetio import resolve
+
+# Background watcher for the viewer's asset files. Polls (mtime, size) — a couple of
+# stat() calls per interval — and parses changed files on its own thread, so the game
+# loop only ever picks up ready-to-apply results via drain().
+
+class AssetWatcher:
+    def __init__(self, paths, loader, initial=None, interval=0.25, notify=None):
+        self.paths = dict(paths)          # kind -> path
+        self.loader = loader              # callable, or {kind: callable}
+        self.interval = interval
+        self.notify = notify              # called (on the watcher thread) after each reload is queued
+        self._last = dict(initial or {})  # kind -> last parsed data (for level diffs)
+        self._sig = {k: self._stat(p) for k, p in self.paths.items()}
+        self._out = queue.Queue()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="asset-watcher", daemon=True)
+
+    @staticmethod
+    def _stat(path):
+        try:
+            st = os.stat(resolve(path))  # plain or compressed variant
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            for kind, path in self.paths.items():
+                sig = self._stat(path)
+                if sig is None or sig == self._sig.get(kind):
+                    continue
+                load = self.loader.get(kind) if isinstance(self.loader, dict) else self.loader
+                try:
+                    data = load(path)
+                except Exception:
+                    # most likely caught mid-write; keep the old signature and retry next poll
+                    continue
+                self._sig[kind] = sig
+                changed = None
+                if kind == "level":
+                    prev = self._last.get("level")
+                    changed = diff_tiles(prev["tiles"], data["tiles"]) if prev else None
+                self._last[kind] = data
+                self._out.put((kind, data, changed))
+                if self.notify is not None:
+                    self.notify()
+
+    def drain(self):
+        # (kind, data, changed_cells_or_None) for every reload since the last call
+        out = []
+        while True:
+            try:
+                out.append(self._out.get_nowait())
+            except queue.Empty:
+                return out
@@ -0,0 +1,66 @@
+# Tile-cell index for level objects (coins, signs, ...). Lookups touch only the cells
+# asked for, and removal is in place, so per-frame pickup/proximity cost does not grow
+# with the number of objects in the level.
+
+class ObjectIndex:
+    def __init__(self, objects=()):
+        self.items = {}    # slot -> obj (insertion ordered, used for drawing)
+        self.cells = {}    # (x, y) -> {type: set(slot)}
+        self.by_type = {}  # type -> set(slot)
+        self._next = 0
+        for obj in objects:
+            self.add(obj)
+
+    def __iter__(self):
+        return iter(self.items.values())
+
+    def __len__(self):
+        return len(self.items)
+
+    def add(self, obj):
+        slot = self._next; self._next += 1
+        self.items[slot] = obj
+        t = obj["type"]
+        self.cells.setdefault((obj["x"], obj["y"]), {}).setdefault(t, set()).add(slot)
+        self.by_type.setdefault(t, set()).add(slot)
+        return slot
+
+    def remove(self, slot):
+        obj = self.items.pop(slot)
+        cell = (obj["x"], obj["y"]); t = obj["type"]
+        kinds = self.cells[cell]
+        kinds[t].discard(slot)
+        if not kinds[t]:
+            del kinds[t]
+            if not kinds:
+                del self.cells[cell]
+        self.by_type[t].discard(slot)
+        return obj
+
+    def count(self, type):
+        return len(self.by_type.get(type, ()))
+
+    def at(self, x, y, type):
+        # slots of `type` in cell (x, y)
+        kinds = self.cells.get((x, y))
+        return kinds.get(type, ()) if kinds else ()
+
+    def in_rect(self, x0, y0, x1, y1):
+        # objects of every type in cells x0 <= x < x1, y0 <= y < y1 (insertion order per cell)
+        cells, items = self.cells, self.items
+        for cy in range(y0, y1):
+            for cx in range(x0, x1):
+                kinds = cells.get((cx, cy))
+                if kinds:
+                    for slot in sorted(s for slots in kinds.values() for s in slots):
+                        yield items[slot]
+
+    def near(self, x, y, radius, type):
+        # (slot, obj) of `type` in the (2r+1)^2 cells around (x, y)
+        cells, items = self.cells, self.items
+        for cy in range(y - radius, y + radius + 1):
+            for cx in range(x - radius, x + radius + 1):
+                kinds = cells.get((cx, cy))
+                if kinds and type in kinds:
+                    for slot in kinds[type]:
+                        yield slot, items[slot]
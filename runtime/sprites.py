@@ -0,0 +1,81 @@
+import pygame
+from runtime.world import TILE, PLAYER_SIZE
+
+# Sprites for the viewers. Every entity image (coin, sign, player, an NPC in each facing)
+# is painted once into a single atlas surface at load time; a frame then draws each layer
+# with one Surface.blits() call over reusable [source, dest, area] entries, so drawing
+# allocates nothing per entity. The atlas cells hold placeholder shapes for now; real art
+# only has to be painted into the same cells.
+
+COIN_COLOR, SIGN_COLOR, PLAYER_COLOR = (220,200,40), (0,150,200), (220,220,220)
+NPC_COLOR, NOTCH_COLOR, LABEL_COLOR = (200,80,80), (255,180,180), (230,230,230)
+
+# facing -> notch inside the NPC's tile ((0, 0): the whole tile, as before facings existed)
+NOTCHES = {(1, 0): (TILE-4, 10, 4, 12), (-1, 0): (0, 10, 4, 12),
+           (0, 1): (10, TILE-4, 12, 4), (0, -1): (10, 0, 12, 4), (0, 0): (0, 0, TILE, TILE)}
+
+def _npc_painter(facing):
+    def paint(surf):
+        surf.fill(NPC_COLOR)
+        surf.fill(NOTCH_COLOR, NOTCHES[facing])
+    return paint
+
+class Atlas:
+    def __init__(self):
+        sprites = [("coin", TILE, lambda s: s.fill(COIN_COLOR)),
+                   ("sign", TILE, lambda s: s.fill(SIGN_COLOR)),
+                   ("player", PLAYER_SIZE, lambda s: s.fill(PLAYER_COLOR))]
+        sprites += [(("npc", f), TILE, _npc_painter(f)) for f in NOTCHES]
+        self.surface = pygame.Surface((TILE * len(sprites), TILE)).convert()
+        self.areas = {}   # name -> Rect of its cell in self.surface
+        for i, (name, size, paint) in enumerate(sprites):
+            area = pygame.Rect(i * TILE, 0, size, size)
+            paint(self.surface.subsurface(area))
+            self.areas[name] = area
+        self.npc = {f: self.areas[("npc", f)] for f in NOTCHES}  # facing -> area
+
+class Labels:
+    # text -> surface, rendered once per distinct text
+    def __init__(self, font, color=LABEL_COLOR):
+        self.font, self.color = font, color
+        self.cache = {}
+
+    def get(self, text):
+        surf = self.cache.get(text)
+        if surf is None:
+            surf = self.cache[text] = self.font.render(text, True, self.color)
+        return surf
+
+class Layer:
+    # one blits() batch, refilled every frame into the same entries and dest rects
+    def __init__(self):
+        self.items = []
+        self._spare = []
+        self.n = 0
+
+    def clear(self):
+        self.n = 0
+
+    def add(self, source, x, y, area=None):
+        items = self.items
+        if self.n < len(items):
+            item = items[self.n]
+        else:
+            item = self._spare.pop() if self._spare else [None, pygame.Rect(0, 0, 0, 0), None]
+            items.append(item)
+        item[0] = source
+        item[1].x = x; item[1].y = y
+        item[2] = area
+        self.n += 1
+
+    def move(self, dx, dy):
+        # shift every entry, e.g. when the camera scrolls
+        for item in self.items[:self.n]:
+            item[1].move_ip(dx, dy)
+
+    def draw(self, target):
+        if self.n < len(self.items):
+            self._spare.extend(self.items[self.n:])
+            del self.items[self.n:]
+        if self.items:
+            target.blits(self.items, doreturn=False)
@@ -0,0 +1,327 @@
+import collections, json, os, queue, threading, pygame
+from core import assetio
+from core.chunks import generate_chunk
+from runtime.objindex import ObjectIndex
+from runtime.world import TILE, PLAYER_SIZE, WALL, VIEW_TILES
+from runtime.sprites import Atlas, Layer
+
+# Infinite streaming world: chunks are generated from (world seed, cx, cy) on a
+# background thread as the player approaches, prefetched along the direction of
+# travel, and kept in a bounded LRU (dirty chunks are optionally persisted on eviction,
+# tagged with the world seed: a chunk saved for another seed is regenerated instead).
+# Everything touching the cache or pygame stays on the main thread.
+
+def load_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+class Chunk:
+    def __init__(self, data, seed):
+        self.seed = seed
+        self.cx, self.cy, self.size = data["cx"], data["cy"], data["size"]
+        self.tiles = data["tiles"]
+        self.objects = ObjectIndex(data["objects"])
+        self.dirty = False  # coins taken since generation/load
+
+    def to_json(self):
+        return {"seed": self.seed, "cx": self.cx, "cy": self.cy, "size": self.size,
+                "tiles": self.tiles, "objects": list(self.objects)}
+
+class ChunkStore:
+    def __init__(self, seed, size, capacity=64, persist_dir=None, workers=1):
+        self.seed, self.size = seed, size
+        self.capacity = capacity
+        self.persist_dir = persist_dir
+        self.cache = collections.OrderedDict()  # (cx, cy) -> Chunk, oldest first
+        self.wanted = frozenset()               # read by workers to drop stale requests
+        self._pending = set()
+        self._seq = 0
+        self._requests = queue.PriorityQueue()
+        self._ready = queue.Queue()
+        self._threads = [threading.Thread(target=self._work, name=f"chunkgen-{i}", daemon=True)
+                         for i in range(workers)]
+        for t in self._threads:
+            t.start()
+
+    def _chunk_path(self, key):
+        return os.path.join(self.persist_dir, f"{key[0]}_{key[1]}.json")
+
+    def _work(self):
+        while True:
+            _, _, key = self._requests.get()
+            if key is None:
+                return
+            if key not in self.wanted:
+                self._ready.put((key, None)); continue
+            data = None
+            if self.persist_dir and os.path.exists(self._chunk_path(key)):
+                try:
+                    data = load_json(self._chunk_path(key))
+                except Exception:
+                    data = None
+                if data is not None and (data.get("seed"), data.get("size")) != (self.seed, self.size):
+                    data = None  # saved for another world; overwritten when this one is persisted
+            if data is None:
+                data = generate_chunk(self.seed, key[0], key[1], self.size)
+            self._ready.put((key, Chunk(data, self.seed)))
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def request(self, key, priority):
+        if key in self.cache or key in self._pending:
+            return
+        self._pending.add(key)
+        self._seq += 1
+        self._requests.put((priority, self._seq, key))
+
+    def pump(self):
+        # move finished chunks into the cache; returns how many arrived
+        n = 0
+        while True:
+            try:
+                key, chunk = self._ready.get_nowait()
+            except queue.Empty:
+                break
+            self._pending.discard(key)
+            if chunk is not None:
+                self.cache[key] = chunk; n += 1
+        return n
+
+    def touch(self, keys):
+        for k in keys:
+            if k in self.cache:
+                self.cache.move_to_end(k)
+
+    def evict(self, keep=()):
+        evicted = []
+        for key in list(self.cache):
+            if len(self.cache) <= self.capacity:
+                break
+            if key in keep:
+                continue
+            chunk = self.cache.pop(key)
+            self._persist(chunk)
+            evicted.append(key)
+        return evicted
+
+    def _persist(self, chunk):
+        if not (self.persist_dir and chunk.dirty):
+            return
+        with assetio.atomic_open(self._chunk_path((chunk.cx, chunk.cy))) as f:
+            json.dump(chunk.to_json(), f, separators=(",", ":"))
+        chunk.dirty = False
+
+    def close(self):
+        for _ in self._threads:
+            self._requests.put((-1, -1, None))
+        for chunk in self.cache.values():
+            self._persist(chunk)
+
+class StreamWorld:
+    def __init__(self, store, spawn, view_radius=2, lookahead=2):
+        self.store = store
+        self.size = store.size
+        self.view_radius = view_radius
+        self.lookahead = lookahead
+        px, py = spawn
+        self.player = pygame.Rect(px*TILE + (TILE-PLAYER_SIZE)//2,
+                                  py*TILE + (TILE-PLAYER_SIZE)//2,
+                                  PLAYER_SIZE, PLAYER_SIZE)
+        self.speed = 3
+        self.coins_collected = 0
+        self.heading = (0, 0)
+
+    def chunk_at_cell(self, x, y):
+        return self.store.get((x // self.size, y // self.size))
+
+    def tile(self, x, y):
+        chunk = self.chunk_at_cell(x, y)
+        if chunk is None:
+            return WALL  # not streamed in yet: solid until it arrives
+        return chunk.tiles[y - chunk.cy*self.size][x - chunk.cx*self.size]
+
+    def hits_wall(self, rect):
+        for y in range(rect.top // TILE, (rect.bottom - 1) // TILE + 1):
+            for x in range(rect.left // TILE, (rect.right - 1) // TILE + 1):
+                if self.tile(x, y) == WALL:
+                    return True
+        return False
+
+    def player_can_move(self, dx, dy):
+        return not self.hits_wall(self.player.move(dx, dy))
+
+    def move_player(self, dx, dy):
+        if dx or dy:
+            self.heading = ((dx > 0) - (dx < 0), (dy > 0) - (dy < 0))
+        if dx and self.player_can_move(dx, 0): self.player.move_ip(dx, 0)
+        if dy and self.player_can_move(0, dy): self.player.move_ip(0, dy)
+
+    def pickup_coins(self):
+        p = self.player
+        for y in range(p.top // TILE, (p.bottom - 1) // TILE + 1):
+            for x in range(p.left // TILE, (p.right - 1) // TILE + 1):
+                chunk = self.chunk_at_cell(x, y)
+                if chunk is None:
+                    continue
+                for slot in list(chunk.objects.at(x, y, "coin")):
+                    chunk.objects.remove(slot)
+                    chunk.dirty = True
+                    self.coins_collected += 1
+
+    def nearest_sign(self, rect, max_dist=36):
+        nearest, best = None, max_dist * max_dist
+        cx, cy = rect.center
+        gx, gy = cx // TILE, cy // TILE
+        half = TILE // 2
+        r = -(-max_dist // TILE)
+        seen = set()
+        for y in (gy - r, gy + r):
+            for x in (gx - r, gx + r):
+                chunk = self.chunk_at_cell(x, y)
+                if chunk is None or id(chunk) in seen:
+                    continue
+                seen.add(id(chunk))
+                for _, obj in chunk.objects.near(gx, gy, r, "sign"):
+                    ox, oy = obj["x"]*TILE + half, obj["y"]*TILE + half
+                    d2 = (cx-ox)*(cx-ox) + (cy-oy)*(cy-oy)
+                    if d2 <= best:
+                        best, nearest = d2, obj
+        return nearest
+
+    def stream(self):
+        # request the ring around the player plus a look-ahead strip along the heading
+        size = self.size
+        pcx = self.player.centerx // TILE // size
+        pcy = self.player.centery // TILE // size
+        r = self.view_radius
+        wanted = {}
+        for cy in range(pcy - r, pcy + r + 1):
+            for cx in range(pcx - r, pcx + r + 1):
+                wanted[(cx, cy)] = max(abs(cx - pcx), abs(cy - pcy))
+        hx, hy = self.heading
+        if hx or hy:
+            for step in range(r + 1, r + 1 + self.lookahead):
+                for side in range(-1, 2):
+                    key = (pcx + hx*step + (side if not hx else 0), pcy + hy*step + (side if not hy else 0))
+                    wanted.setdefault(key, step)
+        store = self.store
+        store.wanted = frozenset(wanted)
+        for key, prio in sorted(wanted.items(), key=lambda kv: kv[1]):
+            store.request(key, prio)
+        arrived = store.pump()
+        store.touch(wanted)
+        evicted = store.evict(keep=wanted)
+        return arrived, evicted
+
+def run_stream_viewer(project: str, capacity: int = 64, persist: bool = True):
+    world_path = f"assets/{project}_world.json"
+    if not assetio.exists(world_path):
+        print("No generated world yet. Run: python run.py --stream --viewer")
+        return
+    manifest = assetio.read_json(world_path)
+    size = manifest.get("chunk_size", 16)
+    persist_dir = f"assets/{project}_world_chunks" if persist else None
+    store = ChunkStore(manifest["seed"], size, capacity=capacity, persist_dir=persist_dir)
+    world = StreamWorld(store, manifest.get("player_spawn", [2, 2]))
+
+    pygame.init()
+    font = pygame.font.SysFont(None, 20)
+    big  = pygame.font.SysFont(None, 28)
+    w, h = VIEW_TILES[0]*TILE, VIEW_TILES[1]*TILE
+    screen = pygame.display.set_mode((w, h))
+    pygame.display.set_caption("Eclipsera Stream — WASD/arrows move • E read • ESC quit")
+    clock = pygame.time.Clock()
+    atlas = Atlas()
+    object_layer = Layer()
+
+    # Chunk static layers (grid + walls), rendered on demand, at most one per frame
+    surfaces = collections.OrderedDict()
+    surface_cap = 16
+    chunk_px = size * TILE
+
+    def render_chunk(chunk):
+        surf = pygame.Surface((chunk_px, chunk_px)).convert()
+        surf.fill((24,24,24))
+        for y, row in enumerate(chunk.tiles):
+            for x, c in enumerate(row):
+                r = pygame.Rect(x*TILE, y*TILE, TILE, TILE)
+                pygame.draw.rect(surf, (58,58,58), r, 1)
+                if c == WALL:
+                    pygame.draw.rect(surf, (90,90,90), r)
+        return surf
+
+    sign_lines = None
+    world.stream()
+    while True:
+        for e in pygame.event.get():
+            if e.type == pygame.QUIT:
+                store.close(); pygame.quit(); return
+            if e.type == pygame.KEYDOWN:
+                if e.key == pygame.K_ESCAPE:
+                    if sign_lines:
+                        sign_lines = None
+                    else:
+                        store.close(); pygame.quit(); return
+                elif e.key == pygame.K_e and not sign_lines:
+                    sign = world.nearest_sign(world.player)
+                    if sign:
+                        sign_lines = [sign.get("text", "(blank)")]
+                elif e.key in (pygame.K_SPACE, pygame.K_RETURN):
+                    sign_lines = None
+
+        keys = pygame.key.get_pressed()
+        if not sign_lines:
+            dx = dy = 0
+            if keys[pygame.K_LEFT] or keys[pygame.K_a]:   dx -= world.speed
+            if keys[pygame.K_RIGHT] or keys[pygame.K_d]:  dx += world.speed
+            if keys[pygame.K_UP] or keys[pygame.K_w]:     dy -= world.speed
+            if keys[pygame.K_DOWN] or keys[pygame.K_s]:   dy += world.speed
+            world.move_player(dx, dy)
+            world.pickup_coins()
+        _, evicted = world.stream()
+        for key in evicted:
+            surfaces.pop(key, None)
+
+        # camera follows the player
+        cam_x = world.player.centerx - w // 2
+        cam_y = world.player.centery - h // 2
+        screen.fill((12,12,12))
+        object_layer.clear()
+        rendered = False
+        for cy in range(cam_y // chunk_px, (cam_y + h) // chunk_px + 1):
+            for cx in range(cam_x // chunk_px, (cam_x + w) // chunk_px + 1):
+                chunk = store.get((cx, cy))
+                if chunk is None:
+                    continue
+                surf = surfaces.get((cx, cy))
+                if surf is None:
+                    if rendered:
+                        continue  # spread layer rendering over frames
+                    surf = surfaces[(cx, cy)] = render_chunk(chunk); rendered = True
+                    while len(surfaces) > surface_cap:
+                        surfaces.popitem(last=False)
+                else:
+                    surfaces.move_to_end((cx, cy))
+                ox, oy = cx*chunk_px - cam_x, cy*chunk_px - cam_y
+                screen.blit(surf, (ox, oy))
+                for obj in chunk.objects:
+                    area = atlas.areas.get(obj["type"])
+                    if area is not None:
+                        object_layer.add(atlas.surface, obj["x"]*TILE - cam_x, obj["y"]*TILE - cam_y, area)
+        object_layer.draw(screen)
+        screen.blit(atlas.surface, (world.player.x - cam_x, world.player.y - cam_y), atlas.areas["player"])
+
+        hud = big.render(f"Coins: {world.coins_collected}", True, (255,255,255))
+        screen.blit(hud, (8, 6))
+        info = font.render(f"chunk {world.player.centerx // TILE // size},{world.player.centery // TILE // size}"
+                           f" • cached {len(store.cache)}/{store.capacity}", True, (180,180,180))
+        screen.blit(info, (w - info.get_width() - 8, 8))
+        if sign_lines:
+            box = pygame.Surface((w - 24, 60), pygame.SRCALPHA)
+            box.fill((0, 0, 0, 200))
+            screen.blit(box, (12, h - 72))
+            screen.blit(font.render(sign_lines[0], True, (230,230,230)), (24, h - 56))
+
+        pygame.display.flip()
+        clock.tick(60)
@@ -1,122 +1,107 @@
-import json, os, pygame, random
-
-TILE = 32
-PLAYER_SIZE = 24
-WALL = "#"
+import collections, time, pygame
+from runtime.world import TILE, VIEW_TILES, World, rect_for_grid
+from runtime.hotreload import AssetWatcher
+from runtime.sprites import Atlas, Labels, Layer
+from runtime.assets import load_asset
+from core.dialogue import DialogueStore, END, index_path
+from core.npcgen import npcs_path as current_npcs_path
+from core import assetio
+
+FPS = 60
+BACKGROUND_FPS = 10   # unfocused or minimized window
+MAX_NPC_PARTS = 8     # frame budget: at most this many frames per NPC update
+STATIC_CHUNK = 16     # the static layer is cached in squares of this many cells
+STATIC_CACHE = 32     # ...at most this many of them
 
 def load_json(path):
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-def rect_for_grid(x, y, tile=TILE, w=TILE, h=TILE):
-    return pygame.Rect(x*tile, y*tile, w, h)
-
-# --- NPC with idle wander + anti-sticking + correct facing ---
-class NPC:
-    def __init__(self, data):
-        self.id = data["id"]
-        self.name = data.get("name", self.id)
-        self.grid_x = data["x"]
-        self.grid_y = data["y"]
-        self.rect = rect_for_grid(self.grid_x, self.grid_y)
-        # subpixel position for smooth slow movement
-        self.pos_x = float(self.rect.x)
-        self.pos_y = float(self.rect.y)
-        self.speed = 1.2
-        self.cooldown = 0
-        self.dir = (0, 0)      # (-1,0,1)
-        self.facing = (0, 1)   # draw hint (down)
-
-    def _choose_new_intention(self):
-        # more idling than walking for natural feel
-        choices = [(0,0)]*6 + [(1,0), (-1,0), (0,1), (0,-1)]
-        self.dir = random.choice(choices)
-        self.cooldown = random.randint(30, 90)
-
-    def update(self, can_move_fn, stop=False):
-        if stop:
-            self.dir = (0, 0)
-            self.cooldown = 15
-            return
+    # parsed via the compiled asset cache (data/.asset_cache), rebuilt when the source changes
+    return load_asset(path)
 
-        if self.cooldown <= 0:
-            self._choose_new_intention()
-
-        dx = self.dir[0] * self.speed
-        dy = self.dir[1] * self.speed
-        moved_any = False
-
-        # axis-separated small steps; ignore my own id during collision
-        if dx:
-            step_x = 1 if dx > 0 else -1
-            if can_move_fn(self.rect, step_x, 0, ignore_id=self.id):
-                self.pos_x += dx
-                self.rect.x = int(round(self.pos_x))
-                moved_any = True
-        if dy:
-            step_y = 1 if dy > 0 else -1
-            if can_move_fn(self.rect, 0, step_y, ignore_id=self.id):
-                self.pos_y += dy
-                self.rect.y = int(round(self.pos_y))
-                moved_any = True
-
-        if moved_any and self.dir != (0,0):
-            self.facing = self.dir
-        else:
-            # if blocked, force a re-pick next frame
-            self.cooldown = 0
-
-        self.cooldown -= 1
-
-    def face_toward(self, target_center):
-        cx, cy = self.rect.center
-        tx, ty = target_center
-        dx, dy = (tx - cx), (ty - cy)
-        # Correct Y: screen Y grows downward, so "up" is dy < 0
-        if abs(dx) > abs(dy):
-            self.facing = (1, 0) if dx > 0 else (-1, 0)
-        else:
-            self.facing = (0, -1) if dy < 0 else (0, 1)
-
-def run_viewer(project: str):
+def run_viewer(project: str, watch: bool = True, frame_budget_ms: float = None):
     level_path = f"assets/{project}_level_meadow_v1.json"
-    npcs_path  = f"assets/{project}_npcs.json"
+    npcs_path  = current_npcs_path(project)  # .jsonl for large populations
     dialogue_path = f"assets/{project}_dialogue.json"
+    dialogue_index_path = index_path(project)
 
-    if not (os.path.exists(level_path) and os.path.exists(npcs_path)):
+    if not (assetio.exists(level_path) and assetio.exists(npcs_path)):
         print("No generated assets yet. Run: python run.py --viewer")
         return
 
     lvl = load_json(level_path)
     npcs_data = load_json(npcs_path)
-    dialogue = load_json(dialogue_path) if os.path.exists(dialogue_path) else {}
+    def open_npcs(_path=None):
+        return load_json(current_npcs_path(project))
+    def open_dialogue(_path=None):
+        return DialogueStore.open(project, loader=load_json)
+    dialogue = open_dialogue()
 
     pygame.init()
+    reload_event = pygame.event.custom_type()
     font = pygame.font.SysFont(None, 20)
     big  = pygame.font.SysFont(None, 28)
 
-    tiles = lvl["tiles"]
-    rows, cols = len(tiles), len(tiles[0])
-    w, h = cols*TILE, rows*TILE
+    world = World(lvl, npcs_data)
+    def view_size():
+        # the whole level when it fits, else a camera view that follows the player
+        return min(world.w, VIEW_TILES[0]*TILE), min(world.h, VIEW_TILES[1]*TILE)
+    w, h = view_size()
     screen = pygame.display.set_mode((w, h))
     pygame.display.set_caption("Eclipsera Viewer — WASD/arrows move • E talk/read • SPACE next • ESC quit")
 
-    # Walls
-    wall_rects = [rect_for_grid(x, y) for y, row in enumerate(tiles) for x, c in enumerate(row) if c == WALL]
+    player = world.player
 
-    # Objects (coins + signs)
-    objects = lvl.get("objects", [])
+    # Entities: atlas cells drawn in one blits() batch per layer; the object layer is
+    # only refilled when coins are picked up or the level reloads
+    atlas = Atlas()
+    labels = Labels(font)
+    object_layer, npc_layer, label_layer = Layer(), Layer(), Layer()
+    objects_drawn = [None, -1, None, None]   # ObjectIndex, size, visible cells and camera of object_layer
 
-    # NPCs
-    npcs = [NPC(d) for d in npcs_data]
-    npc_map = {n.id: n for n in npcs}
+    # Static layer (background, grid, walls): squares of STATIC_CHUNK cells, painted when
+    # they first come into view, kept in a small LRU and patched per cell on reload
+    chunk_px = STATIC_CHUNK * TILE
+    static = collections.OrderedDict()   # (cx, cy) -> surface, least recently drawn first
 
-    # Player (centered inside tile)
-    px, py = lvl["player_spawn"]
-    player = pygame.Rect(px*TILE + (TILE-PLAYER_SIZE)//2,
-                         py*TILE + (TILE-PLAYER_SIZE)//2,
-                         PLAYER_SIZE, PLAYER_SIZE)
-    speed = 3
+    def paint_cell(x, y):
+        surf = static.get((x // STATIC_CHUNK, y // STATIC_CHUNK))
+        if surf is None:
+            return
+        r = rect_for_grid(x % STATIC_CHUNK, y % STATIC_CHUNK)
+        pygame.draw.rect(surf, (24,24,24), r)
+        pygame.draw.rect(surf, (58,58,58), r, 1)
+        if (x, y) in world.walls:
+            pygame.draw.rect(surf, (90,90,90), r)
+
+    def static_chunk(key):
+        surf = static.get(key)
+        if surf is not None:
+            static.move_to_end(key)
+            return surf
+        static[key] = pygame.Surface((chunk_px, chunk_px)).convert()
+        cx, cy = key
+        for y in range(cy*STATIC_CHUNK, min((cy+1)*STATIC_CHUNK, world.rows)):
+            for x in range(cx*STATIC_CHUNK, min((cx+1)*STATIC_CHUNK, world.cols)):
+                paint_cell(x, y)
+        while len(static) > STATIC_CACHE:
+            static.popitem(last=False)
+        return static[key]
+
+    def wake():
+        # a reload is ready: end an idle wait (SDL's event queue is thread-safe)
+        try:
+            pygame.event.post(pygame.event.Event(reload_event))
+        except pygame.error:
+            pass  # viewer already closed
+
+    # Hot reload: watch the generated assets, parse in the background, apply here
+    watcher = None
+    if watch:
+        watcher = AssetWatcher({"level": level_path, "npcs": f"assets/{project}_npcs.json",
+                                "npcs_stream": f"assets/{project}_npcs.jsonl",
+                                "dialogue": dialogue_path, "dialogue_index": dialogue_index_path},
+                               {"level": load_json, "npcs": open_npcs, "npcs_stream": open_npcs,
+                                "dialogue": open_dialogue, "dialogue_index": open_dialogue},
+                               initial={"level": lvl}, notify=wake).start()
 
     # Dialogue/sign state
     talking_to = None
@@ -124,64 +109,46 @@ def run_viewer(project: str):
     is_dialogue_open = False
     sign_buffer = []
 
-    # Coins/HUD
-    coins_total = sum(1 for o in objects if o["type"] == "coin")
-    coins_collected = 0
-    win = False
-
     clock = pygame.time.Clock()
-
-    def can_move(rect, dx, dy, ignore_id=None):
-        trial = rect.move(dx, dy)
-        # walls
-        for wrect in wall_rects:
-            if trial.colliderect(wrect):
-                return False
-        # npcs (other than me if I'm an npc)
-        for n in npcs:
-            if ignore_id is not None and n.id == ignore_id:
-                continue
-            if trial.colliderect(n.rect):
-                return False
-        # player blocks npcs too
-        if ignore_id is not None and trial.colliderect(player):
-            return False
-        # bounds
-        if trial.left < 0 or trial.top < 0 or trial.right > w or trial.bottom > h:
-            return False
-        return True
-
-    def player_can_move(dx, dy):
-        trial = player.move(dx, dy)
-        for wrect in wall_rects:
-            if trial.colliderect(wrect): return False
-        for n in npcs:
-            if trial.colliderect(n.rect): return False
-        if not (0 <= trial.left and 0 <= trial.top and trial.right <= w and trial.bottom <= h):
-            return False
-        return True
-
-    def nearest_npc(rect, max_dist=36):
-        nearest, best = None, 1e9
-        cx, cy = rect.center
-        for n in npcs:
-            nx, ny = n.rect.center
-            d = ((cx-nx)**2 + (cy-ny)**2) ** 0.5
-            if d < best and d <= max_dist:
-                best, nearest = d, n
-        return nearest
-
-    def nearest_sign(rect, max_dist=36):
-        nearest, best = None, 1e9
-        cx, cy = rect.center
-        for obj in objects:
-            if obj["type"] != "sign": continue
-            orect = rect_for_grid(obj["x"], obj["y"])
-            ox, oy = orect.center
-            d = ((cx-ox)**2 + (cy-oy)**2) ** 0.5
-            if d < best and d <= max_dist:
-                best, nearest = d, obj
-        return nearest
+    frame = 0
+
+    # Pacing: redraw only when something changed, sleep in event.wait() while nothing can
+    # change, tick slowly in the background; with a frame budget, NPCs step in slices
+    frame_ms = 1000 / FPS
+    dirty = True            # screen differs from the last flip
+    focused = visible = True
+    pending = []            # the event that ended an idle wait
+    npc_parts, work_ms = 1, 0.0
+
+    # Dialogue lines wrapped once per conversation for the current font/box width
+    wrapped = {}   # (npc_id, node) -> lines
+
+    def conversation_lines(npc_id, conv):
+        box_px = w - 48
+        for node in range(len(conv)):
+            key = (npc_id, node)
+            if key not in wrapped:
+                lines = wrap_text(conv.text[node], box_px)
+                opts = conv.choices.get(node)
+                if opts:
+                    lines = lines[:max(1, 3 - len(opts))] + [f"{i+1}) {label}" for i, (label, _) in enumerate(opts[:9])]
+                wrapped[key] = lines
+
+    def open_conversation(npc):
+        conv = dialogue.get(npc.id)
+        if conv is not None:
+            conversation_lines(npc.id, conv)
+            return conv.start
+        return 0
+
+    def near_npc_ids(radius_tiles=5):
+        gx, gy = player.centerx // TILE, player.centery // TILE
+        ids = []
+        for y in range(gy - radius_tiles, gy + radius_tiles + 1):
+            for x in range(gx - radius_tiles, gx + radius_tiles + 1):
+                for n in world.npc_cells.get((x, y), ()):
+                    ids.append(n.id)
+        return ids
 
     def wrap_text(text, max_px):
         words, lines, cur = text.split(), [], ""
@@ -195,46 +162,51 @@ def run_viewer(project: str):
         return lines
 
     def draw_world():
-        screen.fill((24,24,24))
-        # grid
-        for y in range(rows):
-            for x in range(cols):
-                pygame.draw.rect(screen, (58,58,58), rect_for_grid(x, y), 1)
-        # walls
-        for wr in wall_rects:
-            pygame.draw.rect(screen, (90,90,90), wr)
-        # objects
-        for obj in objects:
-            r = rect_for_grid(obj["x"], obj["y"])
-            if obj["type"] == "coin":
-                pygame.draw.rect(screen, (220,200,40), r)
-            elif obj["type"] == "sign":
-                pygame.draw.rect(screen, (0,150,200), r)
-
-        # npcs + name + facing notch
-        for n in npcs:
-            pygame.draw.rect(screen, (200,80,80), n.rect)
-            name_surf = font.render(n.name, True, (230,230,230))
-            screen.blit(name_surf, (n.rect.x, n.rect.y-18))
-            fx, fy = n.facing
-            notch = n.rect.copy()
-            if fx == 1:   notch = pygame.Rect(n.rect.right-4, n.rect.y+10, 4, 12)
-            if fx == -1:  notch = pygame.Rect(n.rect.left,      n.rect.y+10, 4, 12)
-            if fy == 1:   notch = pygame.Rect(n.rect.x+10,      n.rect.bottom-4, 12, 4)
-            if fy == -1:  notch = pygame.Rect(n.rect.x+10,      n.rect.top,       12, 4)
-            pygame.draw.rect(screen, (255,180,180), notch)
+        # camera follows the player, clamped to the level (fixed when the level fits)
+        cam_x = max(0, min(world.w - w, player.centerx - w // 2))
+        cam_y = max(0, min(world.h - h, player.centery - h // 2))
+        for cy in range(cam_y // chunk_px, (cam_y + h - 1) // chunk_px + 1):
+            for cx in range(cam_x // chunk_px, (cam_x + w - 1) // chunk_px + 1):
+                screen.blit(static_chunk((cx, cy)), (cx*chunk_px - cam_x, cy*chunk_px - cam_y))
+
+        # objects in the visible cells; refilled when those change, shifted when only the camera does
+        objects = world.objects
+        view = (cam_x // TILE, cam_y // TILE, (cam_x + w - 1) // TILE + 1, (cam_y + h - 1) // TILE + 1)
+        if objects_drawn[0] is not objects or objects_drawn[1:3] != [len(objects), view]:
+            object_layer.clear()
+            for obj in objects.in_rect(*view):
+                area = atlas.areas.get(obj["type"])
+                if area is not None:
+                    object_layer.add(atlas.surface, obj["x"]*TILE - cam_x, obj["y"]*TILE - cam_y, area)
+            objects_drawn[:] = objects, len(objects), view, (cam_x, cam_y)
+        elif objects_drawn[3] != (cam_x, cam_y):
+            object_layer.move(objects_drawn[3][0] - cam_x, objects_drawn[3][1] - cam_y)
+            objects_drawn[3] = (cam_x, cam_y)
+        object_layer.draw(screen)
+
+        # npcs in (or just outside) view, facing baked into the atlas cell + cached name labels
+        npc_layer.clear(); label_layer.clear()
+        npc_areas, cells = atlas.npc, world.npc_cells
+        for gy in range(cam_y // TILE - 1, (cam_y + h) // TILE + 2):
+            for gx in range(cam_x // TILE - 1, (cam_x + w) // TILE + 2):
+                for n in cells.get((gx, gy), ()):
+                    x, y = n.rect.x - cam_x, n.rect.y - cam_y
+                    npc_layer.add(atlas.surface, x, y, npc_areas[n.facing])
+                    label_layer.add(labels.get(n.name), x, y-18)
+        npc_layer.draw(screen)
+        label_layer.draw(screen)
 
         # player
-        pygame.draw.rect(screen, (220,220,220), player)
+        screen.blit(atlas.surface, (player.x - cam_x, player.y - cam_y), atlas.areas["player"])
 
         # HUD
-        hud = big.render(f"Coins: {coins_collected}/{coins_total}", True, (255,255,255))
+        hud = big.render(f"Coins: {world.coins_collected}/{world.coins_total}", True, (255,255,255))
         screen.blit(hud, (8, 6))
-        if win:
+        if world.win:
             banner = big.render("All coins collected! ESC to quit.", True, (255,255,255))
             screen.blit(banner, (w//2 - banner.get_width()//2, 8))
 
-    def draw_dialogue_box(lines, who=None):
+    def draw_dialogue_box(lines, who=None, choosing=False):
         box = pygame.Surface((w - 24, 110), pygame.SRCALPHA)
         box.fill((0, 0, 0, 200))
         screen.blit(box, (12, h - 122))
@@ -245,14 +217,73 @@ def run_viewer(project: str):
         for L in lines[:3]:
             s = font.render(L, True, (230,230,230))
             screen.blit(s, (24, y)); y += 22
-        hint = font.render("SPACE: next • ESC: close", True, (180,180,180))
+        hint = font.render("1-9: choose • ESC: close" if choosing else "SPACE: next • ESC: close", True, (180,180,180))
         screen.blit(hint, (w - hint.get_width() - 20, h - 28))
 
+    def draw_frame():
+        draw_world()
+        if is_dialogue_open:
+            if talking_to == "SIGN":
+                draw_dialogue_box(sign_buffer)
+            elif talking_to in dialogue:
+                conv = dialogue.get(talking_to)
+                if (talking_to, dlg_index) not in wrapped:
+                    conversation_lines(talking_to, conv)
+                draw_dialogue_box(wrapped[(talking_to, dlg_index)], who=conv.speaker(dlg_index),
+                                  choosing=bool(conv.choices.get(dlg_index)))
+
+    def quit_viewer():
+        if watcher is not None:
+            watcher.stop()
+        dialogue.close()
+        pygame.quit()
+
     # --- main loop ---
     while True:
-        for e in pygame.event.get():
+        t_start = time.perf_counter()
+        changed_frame = False
+        if watcher is not None:
+            for kind, data, changed in watcher.drain():
+                if kind == "level":
+                    changed = world.reload_level(data, changed)
+                    if changed is None:
+                        if view_size() != (w, h):
+                            w, h = view_size()
+                            screen = pygame.display.set_mode((w, h))
+                            wrapped.clear()
+                        static.clear()
+                    else:
+                        for x, y in changed:
+                            paint_cell(x, y)
+                elif kind in ("npcs", "npcs_stream"):
+                    world.reload_npcs(data)
+                    if talking_to not in (None, "SIGN") and talking_to not in world.npc_map:
+                        is_dialogue_open = False; talking_to = None
+                elif kind in ("dialogue", "dialogue_index"):
+                    dialogue.close()
+                    dialogue = data
+                    wrapped.clear()
+                    conv = dialogue.get(talking_to) if talking_to not in (None, "SIGN") else None
+                    if talking_to not in (None, "SIGN") and (conv is None or dlg_index >= len(conv)):
+                        is_dialogue_open = False; talking_to = None
+                print(f"Reloaded {kind}.")
+                changed_frame = True
+
+        events, pending = pending + pygame.event.get(), []
+        for e in events:
+            if e.type == pygame.MOUSEMOTION:
+                continue
+            changed_frame = True
+            if e.type == pygame.WINDOWFOCUSLOST:
+                focused = False
+            elif e.type == pygame.WINDOWFOCUSGAINED:
+                focused = True
+            elif e.type in (pygame.WINDOWMINIMIZED, pygame.WINDOWHIDDEN):
+                visible = False
+            elif e.type in (pygame.WINDOWRESTORED, pygame.WINDOWMAXIMIZED, pygame.WINDOWSHOWN):
+                visible = True
             if e.type == pygame.QUIT:
-                pygame.quit(); return
+                quit_viewer(); return
             if e.type == pygame.KEYDOWN:
                 if e.key == pygame.K_ESCAPE:
                     if is_dialogue_open:
@@ -260,14 +291,14 @@ def run_viewer(project: str):
                         talking_to = None
                         sign_buffer = []
                     else:
-                        pygame.quit(); return
+                        quit_viewer(); return
                 elif e.key == pygame.K_e and not is_dialogue_open:
-                    npc = nearest_npc(player)
+                    npc = world.nearest_npc(player)
                     if npc:
-                        talking_to = npc.id; dlg_index = 0; is_dialogue_open = True
+                        talking_to = npc.id; dlg_index = open_conversation(npc); is_dialogue_open = True
                         npc.face_toward(player.center)
                     else:
-                        sign = nearest_sign(player)
+                        sign = world.nearest_sign(player)
                         if sign:
                             talking_to = "SIGN"
                             sign_buffer = wrap_text(sign.get("text","(blank)"), w - 48)
@@ -278,46 +309,68 @@ def run_viewer(project: str):
                         if talking_to == "SIGN":
                             is_dialogue_open = False; talking_to = None; sign_buffer = []
                         elif talking_to in dialogue:
-                            dlg_index += 1
-                            if dlg_index >= len(dialogue[talking_to]):
-                                is_dialogue_open = False; talking_to = None
+                            conv = dialogue.get(talking_to)
+                            if not conv.choices.get(dlg_index):
+                                dlg_index = conv.advance(dlg_index)
+                                if dlg_index == END:
+                                    is_dialogue_open = False; talking_to = None
+                elif pygame.K_1 <= e.key <= pygame.K_9 and is_dialogue_open and talking_to in dialogue:
+                    conv = dialogue.get(talking_to)
+                    if conv.choices.get(dlg_index):
+                        dlg_index = conv.advance(dlg_index, e.key - pygame.K_1)
+                        if dlg_index == END:
+                            is_dialogue_open = False; talking_to = None
 
         keys = pygame.key.get_pressed()
-        if not is_dialogue_open and not win:
+        before = (player.topleft, world.coins_collected)
+        if not is_dialogue_open and not world.win:
             dx = dy = 0
-            if keys[pygame.K_LEFT] or keys[pygame.K_a]:   dx -= speed
-            if keys[pygame.K_RIGHT] or keys[pygame.K_d]:  dx += speed
-            if keys[pygame.K_UP] or keys[pygame.K_w]:     dy -= speed
-            if keys[pygame.K_DOWN] or keys[pygame.K_s]:   dy += speed
-            if dx and player_can_move(dx, 0): player.move_ip(dx, 0)
-            if dy and player_can_move(0, dy): player.move_ip(0, dy)
+            if keys[pygame.K_LEFT] or keys[pygame.K_a]:   dx -= world.speed
+            if keys[pygame.K_RIGHT] or keys[pygame.K_d]:  dx += world.speed
+            if keys[pygame.K_UP] or keys[pygame.K_w]:     dy -= world.speed
+            if keys[pygame.K_DOWN] or keys[pygame.K_s]:   dy += world.speed
+            world.move_player(dx, dy)
 
             # coin pickup
-            remaining = []
-            for obj in objects:
-                if obj["type"] != "coin":
-                    remaining.append(obj); continue
-                if player.colliderect(rect_for_grid(obj["x"], obj["y"])):
-                    coins_collected += 1
-                else:
-                    remaining.append(obj)
-            objects = remaining
-            if coins_collected >= coins_total and coins_total > 0:
-                win = True
-
-        # update NPCs
-        for n in npcs:
-            n.update(can_move, stop=(is_dialogue_open and talking_to == n.id))
+            world.pickup_coins()
 
-        # draw
-        draw_world()
-        if is_dialogue_open:
-            if talking_to == "SIGN":
-                draw_dialogue_box(sign_buffer)
-            elif talking_to in dialogue:
-                line = dialogue[talking_to][dlg_index]
-                lines = wrap_text(line.get("text",""), w - 48)
-                draw_dialogue_box(lines, who=line.get("who","???"))
+        # update NPCs (a 1/npc_parts slice per frame when over the frame budget)
+        if world.update_npcs(stop_id=talking_to if is_dialogue_open else None,
+                             part=frame % npc_parts, parts=npc_parts):
+            changed_frame = True
+        if (player.topleft, world.coins_collected) != before:
+            changed_frame = True
+        dirty = dirty or changed_frame
 
-        pygame.display.flip()
-        clock.tick(60)
+        # keep only nearby NPCs' conversations loaded (indexed dialogue)
+        frame += 1
+        if frame % 30 == 0:
+            dialogue.prefetch(near_npc_ids())
+
+        # draw
+        if dirty and visible:
+            draw_frame()
+            pygame.display.flip()
+            dirty = False
+
+        if frame_budget_ms:
+            work_ms = 0.8 * work_ms + 0.2 * (time.perf_counter() - t_start) * 1000
+            if frame % 10 == 0:
+                if work_ms > frame_budget_ms and npc_parts < MAX_NPC_PARTS:
+                    npc_parts *= 2
+                elif work_ms < frame_budget_ms / 2 and npc_parts > 1:
+                    npc_parts //= 2
+
+        idle = world.npc_idle_frames() if not changed_frame and npc_parts == 1 else 0
+        if idle is None or idle > 1:
+            # static scene: sleep until an event, or until the first idle NPC may walk
+            t_wait = pygame.time.get_ticks()
+            e = pygame.event.wait() if idle is None else pygame.event.wait(int(idle * frame_ms))
+            if e.type != pygame.NOEVENT:
+                pending.append(e)
+            if idle is not None:
+                slept = int((pygame.time.get_ticks() - t_wait) / frame_ms)
+                world.skip_npc_frames(max(0, min(idle, slept) - 1))
+            clock.tick()
+        else:
+            clock.tick(FPS if focused and visible else BACKGROUND_FPS)
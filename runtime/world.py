@@ -0,0 +1,290 @@
+import pygame, random
+from runtime.objindex import ObjectIndex
+
+TILE = 32
+PLAYER_SIZE = 24
+WALL = "#"
+VIEW_TILES = (25, 19)  # viewer window (tiles) for levels that don't fit on screen
+
+def rect_for_grid(x, y, tile=TILE, w=TILE, h=TILE):
+    return pygame.Rect(x*tile, y*tile, w, h)
+
+def diff_tiles(old, new):
+    # changed (x, y) cells, or None when the grid size differs (full rebuild needed)
+    if len(old) != len(new) or (old and len(old[0]) != len(new[0])):
+        return None
+    changed = []
+    for y, (a, b) in enumerate(zip(old, new)):
+        if a != b:
+            changed.extend((x, y) for x, (ca, cb) in enumerate(zip(a, b)) if ca != cb)
+    return changed
+
+# --- NPC with idle wander + anti-sticking + correct facing ---
+class NPC:
+    def __init__(self, data, rng=random):
+        self.id = data["id"]
+        self.name = data.get("name", self.id)
+        self.grid_x = data["x"]
+        self.grid_y = data["y"]
+        self.rect = rect_for_grid(self.grid_x, self.grid_y)
+        # subpixel position for smooth slow movement
+        self.pos_x = float(self.rect.x)
+        self.pos_y = float(self.rect.y)
+        self.speed = 1.2
+        self.cooldown = 0
+        self.dir = (0, 0)      # (-1,0,1)
+        self.facing = (0, 1)   # draw hint (down)
+        self.rng = rng         # wander choices (seeded by headless playtests)
+
+    def _choose_new_intention(self):
+        # more idling than walking for natural feel
+        choices = [(0,0)]*6 + [(1,0), (-1,0), (0,1), (0,-1)]
+        self.dir = self.rng.choice(choices)
+        self.cooldown = self.rng.randint(30, 90)
+
+    def update(self, can_move_fn, stop=False):
+        # returns True if the NPC moved
+        if stop:
+            self.dir = (0, 0)
+            self.cooldown = 15
+            return False
+
+        if self.cooldown <= 0:
+            self._choose_new_intention()
+
+        dx = self.dir[0] * self.speed
+        dy = self.dir[1] * self.speed
+        moved_any = False
+
+        # axis-separated small steps; ignore my own id during collision
+        if dx:
+            step_x = 1 if dx > 0 else -1
+            if can_move_fn(self.rect, step_x, 0, ignore_id=self.id):
+                self.pos_x += dx
+                self.rect.x = int(round(self.pos_x))
+                moved_any = True
+        if dy:
+            step_y = 1 if dy > 0 else -1
+            if can_move_fn(self.rect, 0, step_y, ignore_id=self.id):
+                self.pos_y += dy
+                self.rect.y = int(round(self.pos_y))
+                moved_any = True
+
+        if moved_any and self.dir != (0,0):
+            self.facing = self.dir
+        elif self.dir != (0,0):
+            # if blocked, force a re-pick next frame
+            self.cooldown = 0
+
+        self.cooldown -= 1
+        return moved_any
+
+    def face_toward(self, target_center):
+        cx, cy = self.rect.center
+        tx, ty = target_center
+        dx, dy = (tx - cx), (ty - cy)
+        # Correct Y: screen Y grows downward, so "up" is dy < 0
+        if abs(dx) > abs(dy):
+            self.facing = (1, 0) if dx > 0 else (-1, 0)
+        else:
+            self.facing = (0, -1) if dy < 0 else (0, 1)
+
+# --- Level state + movement/collision rules, independent of any window ---
+class World:
+    def __init__(self, lvl, npcs_data, rng=random):
+        self.rng = rng
+        self._set_grid(lvl["tiles"])
+
+        # Objects (coins + signs), indexed by tile cell
+        self.objects = ObjectIndex(lvl.get("objects", []))
+
+        # NPCs, also bucketed by the cell of their center (they move)
+        self._set_npcs([NPC(d, rng) for d in npcs_data])
+
+        # Player (centered inside tile)
+        self.player = self._spawn_rect(lvl["player_spawn"])
+        self.speed = 3
+
+        # Coins/HUD
+        self.coins_total = self.objects.count("coin")
+        self.coins_collected = 0
+        self.collected = set()  # (x, y) of picked-up coins, survives reloads
+        self.win = False
+
+    def _set_grid(self, tiles):
+        self.tiles = tiles
+        self.rows, self.cols = len(tiles), len(tiles[0])
+        self.w, self.h = self.cols*TILE, self.rows*TILE
+        # Walls: cell set, so collision only looks at the cells a rect overlaps
+        self.walls = {(x, y) for y, row in enumerate(tiles) for x, c in enumerate(row) if c == WALL}
+
+    def _set_npcs(self, npcs):
+        self.npcs = npcs
+        self.npc_map = {n.id: n for n in npcs}
+        self.npc_cells = {}
+        for n in npcs:
+            self.npc_cells.setdefault(self._npc_cell(n), set()).add(n)
+
+    @staticmethod
+    def _npc_cell(n):
+        return (n.rect.centerx // TILE, n.rect.centery // TILE)
+
+    def _spawn_rect(self, spawn):
+        px, py = spawn
+        return pygame.Rect(px*TILE + (TILE-PLAYER_SIZE)//2,
+                           py*TILE + (TILE-PLAYER_SIZE)//2,
+                           PLAYER_SIZE, PLAYER_SIZE)
+
+    def hits_wall(self, rect):
+        walls = self.walls
+        for y in range(rect.top // TILE, (rect.bottom - 1) // TILE + 1):
+            for x in range(rect.left // TILE, (rect.right - 1) // TILE + 1):
+                if (x, y) in walls:
+                    return True
+        return False
+
+    def hits_npc(self, rect, ignore_id=None):
+        # an NPC (one tile big) can only overlap rect if its center cell is within
+        # one cell of the cells rect covers
+        cells = self.npc_cells
+        for y in range(rect.top // TILE - 1, (rect.bottom - 1) // TILE + 2):
+            for x in range(rect.left // TILE - 1, (rect.right - 1) // TILE + 2):
+                bucket = cells.get((x, y))
+                if bucket:
+                    for n in bucket:
+                        if n.id != ignore_id and rect.colliderect(n.rect):
+                            return True
+        return False
+
+    def can_move(self, rect, dx, dy, ignore_id=None):
+        trial = rect.move(dx, dy)
+        # walls
+        if self.hits_wall(trial):
+            return False
+        # npcs (other than me if I'm an npc)
+        if self.hits_npc(trial, ignore_id):
+            return False
+        # player blocks npcs too
+        if ignore_id is not None and trial.colliderect(self.player):
+            return False
+        # bounds
+        if trial.left < 0 or trial.top < 0 or trial.right > self.w or trial.bottom > self.h:
+            return False
+        return True
+
+    def player_can_move(self, dx, dy):
+        trial = self.player.move(dx, dy)
+        if self.hits_wall(trial): return False
+        if self.hits_npc(trial): return False
+        if not (0 <= trial.left and 0 <= trial.top and trial.right <= self.w and trial.bottom <= self.h):
+            return False
+        return True
+
+    # --- hot reload: swap in new data, keep the player where they are ---
+    def reload_level(self, lvl, changed=None):
+        # returns the changed cells, or None if everything was rebuilt
+        tiles = lvl["tiles"]
+        if changed is None or len(tiles) != self.rows or len(tiles[0]) != self.cols:
+            self._set_grid(tiles)
+            changed = None
+        else:
+            self.tiles = tiles
+            for x, y in changed:
+                if tiles[y][x] == WALL: self.walls.add((x, y))
+                else: self.walls.discard((x, y))
+        self.objects = ObjectIndex(o for o in lvl.get("objects", [])
+                                   if not (o["type"] == "coin" and (o["x"], o["y"]) in self.collected))
+        self.coins_total = self.coins_collected + self.objects.count("coin")
+        self.win = self.coins_collected >= self.coins_total and self.coins_total > 0
+        p = self.player
+        if p.left < 0 or p.top < 0 or p.right > self.w or p.bottom > self.h or self.hits_wall(p):
+            self.player.topleft = self._spawn_rect(lvl["player_spawn"]).topleft
+        return changed
+
+    def reload_npcs(self, npcs_data):
+        # NPCs whose id and spawn cell are unchanged keep their live position/state
+        old = self.npc_map
+        npcs = []
+        for d in npcs_data:
+            n = old.get(d["id"])
+            if n is None or (n.grid_x, n.grid_y) != (d["x"], d["y"]):
+                n = NPC(d, self.rng)
+            else:
+                n.name = d.get("name", n.id)
+            npcs.append(n)
+        self._set_npcs(npcs)
+
+    # --- proximity: neighbouring cells only, squared distances ---
+    def nearest_npc(self, rect, max_dist=36):
+        nearest, best = None, max_dist * max_dist
+        cx, cy = rect.center
+        r = -(-max_dist // TILE)
+        gx, gy = cx // TILE, cy // TILE
+        cells = self.npc_cells
+        for y in range(gy - r, gy + r + 1):
+            for x in range(gx - r, gx + r + 1):
+                for n in cells.get((x, y), ()):
+                    nx, ny = n.rect.center
+                    d2 = (cx-nx)*(cx-nx) + (cy-ny)*(cy-ny)
+                    if d2 <= best:
+                        best, nearest = d2, n
+        return nearest
+
+    def nearest_sign(self, rect, max_dist=36):
+        nearest, best = None, max_dist * max_dist
+        cx, cy = rect.center
+        half = TILE // 2
+        for _, obj in self.objects.near(cx // TILE, cy // TILE, -(-max_dist // TILE), "sign"):
+            ox, oy = obj["x"]*TILE + half, obj["y"]*TILE + half
+            d2 = (cx-ox)*(cx-ox) + (cy-oy)*(cy-oy)
+            if d2 <= best:
+                best, nearest = d2, obj
+        return nearest
+
+    def move_player(self, dx, dy):
+        if dx and self.player_can_move(dx, 0): self.player.move_ip(dx, 0)
+        if dy and self.player_can_move(0, dy): self.player.move_ip(0, dy)
+
+    def pickup_coins(self):
+        # coins fill their tile, so any coin in a cell the player overlaps is touched
+        p, objects = self.player, self.objects
+        for y in range(p.top // TILE, (p.bottom - 1) // TILE + 1):
+            for x in range(p.left // TILE, (p.right - 1) // TILE + 1):
+                for slot in list(objects.at(x, y, "coin")):
+                    objects.remove(slot)
+                    self.coins_collected += 1
+                    self.collected.add((x, y))
+        if self.coins_collected >= self.coins_total and self.coins_total > 0:
+            self.win = True
+
+    def update_npcs(self, stop_id=None, part=0, parts=1, npcs=None):
+        # steps every `parts`-th NPC (of `npcs`, default all) starting at `part`; returns how many moved
+        cells = self.npc_cells
+        moved = 0
+        npcs = self.npcs if npcs is None else npcs
+        for n in (npcs if parts == 1 else npcs[part::parts]):
+            before = self._npc_cell(n)
+            moved += n.update(self.can_move, stop=(stop_id is not None and stop_id == n.id))
+            after = self._npc_cell(n)
+            if after != before:
+                cells[before].discard(n)
+                if not cells[before]:
+                    del cells[before]
+                cells.setdefault(after, set()).add(n)
+        return moved
+
+    # --- idle fast-forward: lets a viewer sleep while nothing can change ---
+    def npc_idle_frames(self):
+        # updates until some NPC may start walking: 0 if one is walking, None without NPCs
+        wait = None
+        for n in self.npcs:
+            if n.dir != (0, 0):
+                return 0
+            if wait is None or n.cooldown < wait:
+                wait = n.cooldown
+        return None if wait is None else max(0, wait)
+
+    def skip_npc_frames(self, frames):
+        # account for `frames` updates in which every NPC was standing still
+        for n in self.npcs:
+            n.cooldown -= frames
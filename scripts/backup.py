@@ -1,32 +1,21 @@
 # scripts/backup.py
-import os, zipfile, datetime, pathlib
+import os, sys, zipfile, datetime
 
-EXCLUDES = {
-    ".venv", "__pycache__", ".git", ".idea", ".vscode", "node_modules"
-}
-EXCLUDE_EXTS = {".zip", ".pyc"}
-
-def should_skip(root, fname):
-    p = pathlib.Path(root) / fname
-    parts = set(p.parts)
-    if parts & EXCLUDES:
-        return True
-    if p.suffix.lower() in EXCLUDE_EXTS:
-        return True
-    return False
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.fsindex import scan
 
 def main():
     ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     out = f"backup_{ts}.zip"
+    idx = scan(".")
+    manifest = []
     with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as z:
-        for root, dirs, files in os.walk("."):
-            # prune excluded dirs
-            dirs[:] = [d for d in dirs if d not in EXCLUDES]
-            for f in files:
-                if should_skip(root, f):
-                    continue
-                fp = os.path.join(root, f)
-                z.write(fp)
+        for fp in idx.files():
+            z.write(fp)
+            manifest.append(f"{idx.digest(fp)}  {idx.stat(fp)[0]:>10}  {fp}")
+        # sha1/size per file, to verify a restore (hashes are reused from the index)
+        z.writestr("BACKUP_MANIFEST.txt", "\n".join(manifest) + "\n")
+    idx.save()
     print(f"✅ Backup created: {out}")
 
 if __name__ == "__main__":
@@ -1,30 +1,13 @@
 # scripts/export_code_bundle.py
-import os, datetime, pathlib
+import os, sys, datetime, pathlib
 
-EXCLUDE_DIRS = {".venv", "__pycache__", ".git", "node_modules", ".idea", ".vscode"}
-EXCLUDE_EXTS = {".zip", ".pyc"}
-
-def should_skip(path: pathlib.Path):
-    parts = set(path.parts)
-    if parts & EXCLUDE_DIRS:
-        return True
-    if path.suffix.lower() in EXCLUDE_EXTS:
-        return True
-    return False
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.fsindex import scan
 
 def file_tree(root="."):
-    lines=[]
-    base = pathlib.Path(root).resolve()
-    for p in sorted(base.rglob("*")):
-        if p.is_dir():
-            rel = p.relative_to(base)
-            if should_skip(p): continue
-            lines.append(str(rel) + "/")
-        else:
-            rel = p.relative_to(base)
-            if should_skip(p): continue
-            lines.append(str(rel))
-    return "\n".join(lines)
+    idx = scan(root)
+    entries = [(d.split(os.sep), d + "/") for d in idx.dirs()] + [(f.split(os.sep), f) for f in idx.files()]
+    return "\n".join(line for _, line in sorted(entries))
 
 def main():
     ts = datetime.datetime.now().isoformat(timespec="seconds")
@@ -42,12 +25,9 @@ def main():
         f.write(file_tree("."))
         f.write("\n\n")
 
-        for p in sorted(base.rglob("*")):
-            if p.is_dir(): 
-                continue
-            if should_skip(p): 
-                continue
-            rel = p.relative_to(base)
+        for rel in scan(".").files():
+            p = base / rel
+            rel = pathlib.PurePath(rel)
             try:
                 content = p.read_text(encoding="utf-8")
             except Exception:
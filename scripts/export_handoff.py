@@ -1,46 +1,30 @@
 # scripts/export_handoff.py
-import os, json, datetime, textwrap
+import os, sys, json, datetime, textwrap
 
-ROOT = "."
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.fsindex import scan
+from scripts import logdb
 
-def read_json_lines(path):
-    if not os.path.exists(path): return []
-    out = []
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line: continue
-            try:
-                out.append(json.loads(line))
-            except Exception:
-                pass
-    return out
+ROOT = "."
 
 def file_tree(root="."):
     lines=[]
-    base_depth = root.count(os.sep)
-    for r, dirs, files in os.walk(root):
-        # prune noisy stuff
-        dirs[:] = [d for d in dirs if d not in (".venv","__pycache__", ".git", "node_modules")]
-        depth = r.count(os.sep)-base_depth
+    for r, dirs, files in scan(root).walk():
+        depth = r.count(os.sep) + 1 if r else 0
         indent = "  "*depth
-        name = os.path.basename(r) or r
+        name = os.path.basename(r) or root
         lines.append(f"{indent}{name}")
-        for f in sorted(files):
-            if f.endswith((".zip",".pyc")): continue
+        for f in files:
             lines.append(f"{indent}  - {f}")
     return "\n".join(lines)
 
-def last_plan_summary(task_log_events):
-    # find the last event of type "plan"
-    for ev in reversed(task_log_events):
-        if ev.get("type") == "plan":
-            plan = ev.get("plan", {})
-            goal = plan.get("goal", "(unknown)")
-            tasks = plan.get("tasks", [])
-            tasks_str = "\n".join([f"  - {t.get('skill')} {t.get('args',{})}" for t in tasks])
-            return f"Goal: {goal}\nTasks:\n{tasks_str}"
-    return "No plan recorded yet."
+def last_plan_summary(plan):
+    if plan is None:
+        return "No plan recorded yet."
+    goal = plan.get("goal", "(unknown)")
+    tasks = plan.get("tasks", [])
+    tasks_str = "\n".join([f"  - {t.get('skill')} {t.get('args',{})}" for t in tasks])
+    return f"Goal: {goal}\nTasks:\n{tasks_str}"
 
 def main():
     now = datetime.datetime.now().isoformat(timespec="seconds")
@@ -54,8 +38,12 @@ def main():
         except Exception:
             pass
 
-    events = read_json_lines("data/task_log.jsonl")
-    plan_str = last_plan_summary(events)
+    db = logdb.open_log()
+    try:
+        plan_str = last_plan_summary(logdb.last_plan(db))
+        has_log = db.execute("SELECT 1 FROM events LIMIT 1").fetchone() is not None
+    finally:
+        db.close()
 
     outlines = [p for p in os.listdir("data") if p.endswith("_outline.json")]
     projects = list(state.get("projects", {}).keys())
@@ -81,7 +69,7 @@ Current project snapshot
 ------------------------
 Projects in state: {projects}
 Outlines found: {outlines}
-Task log present: {bool(events)}
+Task log present: {has_log}
 
 Last recorded plan
 ------------------
@@ -0,0 +1,156 @@
+# scripts/fsindex.py
+import hashlib, os, pickle, threading, time
+
+# Shared, persistent file index for the handoff, code bundle and backup scripts.
+# Every directory entry keeps its mtime, subdirectories and files (size, mtime, sha1);
+# a scan only re-lists directories whose mtime changed and re-stats the files of the
+# others (an in-place edit doesn't touch the directory), so back-to-back exports cost
+# one pass of stat() calls. SHA-1s are computed on demand and kept while the file's
+# (size, mtime) is unchanged.
+
+INDEX_PATH = os.path.join("data", ".fsindex.pickle")
+INDEX_VERSION = 3
+
+EXCLUDE_DIRS = {".venv", "venv", "__pycache__", ".git", ".idea", ".vscode", "node_modules", ".asset_cache",
+                "thumbnails"}
+EXCLUDE_EXTS = {".zip", ".pyc", ".tmp"}
+EXCLUDE_FILES = {os.path.basename(INDEX_PATH), "task_log.sqlite", "task_log.sqlite-journal"}
+
+RACY_NS = 2_000_000_000  # a directory modified this recently may still change within its mtime tick
+
+def excluded_dir(name):
+    return name in EXCLUDE_DIRS
+
+def excluded_file(name):
+    return name in EXCLUDE_FILES or os.path.splitext(name)[1].lower() in EXCLUDE_EXTS
+
+class FileIndex:
+    def __init__(self, root=".", path=INDEX_PATH):
+        self.root = root
+        self.path = path
+        self.entries = {}   # rel dir ("" = root) -> [mtime_ns or None, [subdirs], {name: [size, mtime_ns, sha1]}]
+        self.relisted = 0   # directories re-listed by the last scan
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "rb") as f:
+                data = pickle.load(f)
+            if data.get("version") == INDEX_VERSION and data.get("root") == os.path.abspath(self.root):
+                self.entries = data["entries"]
+        except Exception:
+            pass
+
+    def save(self):
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump({"version": INDEX_VERSION, "root": os.path.abspath(self.root),
+                         "entries": self.entries}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+    def scan(self):
+        now = time.time_ns()
+        old, new = self.entries, {}
+        self.relisted = 0
+        stack = [""]
+        while stack:
+            rel = stack.pop()
+            full = os.path.join(self.root, rel)
+            try:
+                mtime = os.stat(full).st_mtime_ns
+            except OSError:
+                continue
+            entry = old.get(rel)
+            if entry is None or entry[0] != mtime:
+                entry = self._list(full, mtime)
+                if now - mtime < RACY_NS:
+                    entry[0] = None  # re-list next time as well
+                self.relisted += 1
+            elif self._restat(full, entry[2]):
+                self._dirty = True
+            new[rel] = entry
+            stack.extend(os.path.join(rel, d) for d in reversed(entry[1]))
+        if self.relisted or new.keys() != old.keys():
+            self._dirty = True
+        self.entries = new
+        return self
+
+    def _list(self, full, mtime):
+        subdirs, files = [], {}
+        with os.scandir(full) as it:
+            for e in it:
+                if e.is_dir(follow_symlinks=False):
+                    if not excluded_dir(e.name):
+                        subdirs.append(e.name)
+                elif e.is_file() and not excluded_file(e.name):
+                    st = e.stat()
+                    files[e.name] = [st.st_size, st.st_mtime_ns, None]
+        return [mtime, sorted(subdirs), files]
+
+    def _restat(self, full, files):
+        # refresh size/mtime of files in an unchanged directory; True if any changed
+        changed = False
+        for name, rec in list(files.items()):
+            try:
+                st = os.stat(os.path.join(full, name))
+            except OSError:
+                del files[name]; changed = True
+                continue
+            if rec[:2] != [st.st_size, st.st_mtime_ns]:
+                rec[:] = [st.st_size, st.st_mtime_ns, None]; changed = True
+        return changed
+
+    # --- views ---
+    def walk(self, rel=""):
+        # (dir, subdirs, files) top-down in sorted order, like os.walk
+        stack = [rel]
+        while stack:
+            d = stack.pop()
+            entry = self.entries.get(d)
+            if entry is None:
+                continue
+            yield d, entry[1], sorted(entry[2])
+            stack.extend(os.path.join(d, s) for s in reversed(entry[1]))
+
+    def dirs(self):
+        return sorted(d for d in self.entries if d)
+
+    def files(self):
+        # relative paths of every indexed file, sorted by path components
+        out = [os.path.join(d, f) for d, _, files in self.walk() for f in files]
+        return sorted(out, key=lambda p: p.split(os.sep))
+
+    def stat(self, rel):
+        # (size, mtime_ns) as of the last scan
+        d, name = os.path.split(rel)
+        size, mtime, _ = self.entries[d][2][name]
+        return size, mtime
+
+    def digest(self, rel):
+        # sha1 of a file, reused while its size and mtime are unchanged
+        d, name = os.path.split(rel)
+        rec = self.entries[d][2][name]
+        if rec[2] is None:
+            h = hashlib.sha1()
+            with open(os.path.join(self.root, rel), "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    h.update(block)
+            rec[2] = h.hexdigest()
+            self._dirty = True
+        return rec[2]
+
+_shared = {}
+
+def scan(root=".", path=INDEX_PATH):
+    # the process-wide index for `root`, brought up to date and saved
+    idx = _shared.get((root, path))
+    if idx is None:
+        idx = _shared[(root, path)] = FileIndex(root, path)
+    idx.scan()
+    idx.save()
+    return idx
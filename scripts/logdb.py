@@ -0,0 +1,179 @@
+# scripts/logdb.py
+import argparse, datetime, json, os, re, sqlite3, sys, time
+
+# Query tool for data/task_log.jsonl. The log is loaded into an indexed SQLite table
+# (data/task_log.sqlite): one row per event with its ts/type/skill/project and metrics as
+# columns. Each refresh appends only the lines written since the last one (tracked by
+# byte offset), so queries never re-parse the whole log.
+
+LOG_FILE = os.path.join("data", "task_log.jsonl")
+DB_FILE = os.path.join("data", "task_log.sqlite")
+SCHEMA_VERSION = 3
+
+COLUMNS = ("ts", "type", "skill", "project", "ok", "calls", "wall_ms", "cpu_ms", "bytes", "peak_kb", "sampled", "path", "error", "detail")
+GROUPS = {
+    "type": "type", "skill": "skill", "project": "project", "ok": "ok",
+    "day": "strftime('%Y-%m-%d', ts, 'unixepoch', 'localtime')",
+    "hour": "strftime('%Y-%m-%d %H:00', ts, 'unixepoch', 'localtime')",
+}
+
+def connect(db_file=DB_FILE):
+    os.makedirs(os.path.dirname(db_file) or ".", exist_ok=True)
+    db = sqlite3.connect(db_file, timeout=30, isolation_level=None)
+    db.execute("BEGIN IMMEDIATE")
+    db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+    row = db.execute("SELECT value FROM meta WHERE key='schema'").fetchone()
+    if row is None or int(row[0]) != SCHEMA_VERSION:
+        db.execute("DROP TABLE IF EXISTS events")
+        db.execute("DELETE FROM meta")
+        db.execute("CREATE TABLE events (id INTEGER PRIMARY KEY, ts REAL, type TEXT, skill TEXT, project TEXT, "
+                   "ok INTEGER, calls INTEGER, wall_ms REAL, cpu_ms REAL, bytes INTEGER, peak_kb REAL, sampled INTEGER, path TEXT, "
+                   "error TEXT, detail TEXT)")
+        for col in ("ts", "type", "skill", "project"):
+            db.execute(f"CREATE INDEX idx_events_{col} ON events ({col})")
+        db.execute("INSERT INTO meta VALUES ('schema', ?)", (str(SCHEMA_VERSION),))
+    db.execute("COMMIT")
+    return db
+
+def _row(ev):
+    kind = ev.get("type")
+    skill = project = path = error = detail = None
+    ok = calls = wall = cpu = nbytes = peak = sampled = None
+    if kind == "span":
+        skill, project = ev.get("skill"), ev.get("project")
+        ok, wall, cpu = int(bool(ev.get("ok", True))), ev.get("wall_ms"), ev.get("cpu_ms")
+        calls = ev.get("calls") or (ev.get("args") or {}).get("batch") or 1
+        nbytes, peak, error = ev.get("bytes"), ev.get("peak_kb"), ev.get("error")
+        sampled = int(bool(ev.get("sampled")))
+    elif kind == "task_result":
+        task, result = ev.get("task") or {}, ev.get("result") or {}
+        skill, project, ok = task.get("skill"), (task.get("args") or {}).get("project"), 1
+        path = result.get("path") if isinstance(result, dict) else None
+    elif kind == "plan":
+        tasks = (ev.get("plan") or {}).get("tasks") or []
+        project = (tasks[0].get("args") or {}).get("project") if tasks else None
+        detail = json.dumps(ev.get("plan"), ensure_ascii=False)
+    return (ev.get("ts"), kind, skill, project, ok, calls, wall, cpu, nbytes, peak, sampled, path, error, detail)
+
+def _meta(db, key, default=None):
+    row = db.execute("SELECT value FROM meta WHERE key=?", (key,)).fetchone()
+    return row[0] if row else default
+
+def refresh(db, log_file=LOG_FILE):
+    # append events logged since the last refresh; returns how many were added
+    if not os.path.exists(log_file):
+        return 0
+    db.execute("BEGIN IMMEDIATE")  # concurrent refreshers wait instead of double-inserting
+    try:
+        offset = int(_meta(db, "offset", 0))
+        rows = []
+        with open(log_file, "rb") as f:
+            head = f.readline(4096)
+            # a truncated or replaced log is reloaded from scratch
+            if offset > os.fstat(f.fileno()).st_size or _meta(db, "head") not in (None, head.hex()):
+                db.execute("DELETE FROM events")
+                offset = 0
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # partial line still being written
+                offset += len(line)
+                try:
+                    ev = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(ev, dict):
+                    rows.append(_row(ev))
+        db.executemany(f"INSERT INTO events ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})", rows)
+        db.execute("INSERT OR REPLACE INTO meta VALUES ('offset', ?)", (str(offset),))
+        db.execute("INSERT OR REPLACE INTO meta VALUES ('head', ?)", (head.hex(),))
+        db.execute("COMMIT")
+    except BaseException:
+        db.execute("ROLLBACK")
+        raise
+    return len(rows)
+
+def open_log(log_file=LOG_FILE, db_file=DB_FILE):
+    db = connect(db_file)
+    refresh(db, log_file)
+    return db
+
+def parse_time(text, now=None):
+    # "7d", "12h", "30m", "90s" ago, or an ISO date/datetime
+    m = re.fullmatch(r"(\d+(?:\.\d+)?)([smhdw])", text.strip())
+    if m:
+        unit = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}[m.group(2)]
+        return (now or time.time()) - float(m.group(1)) * unit
+    return datetime.datetime.fromisoformat(text).timestamp()
+
+def query(db, by=(), type=None, skill=None, project=None, since=None, until=None, failed=False, limit=None):
+    # (header, rows): events, skill calls (a batch span counts each item), failures and
+    # time/bytes totals per group; avg_ms is per call
+    where, params = [], []
+    for col, val in (("type", type), ("skill", skill), ("project", project)):
+        if val is not None:
+            where.append(f"{col} = ?"); params.append(val)
+    if since is not None:
+        where.append("ts >= ?"); params.append(since)
+    if until is not None:
+        where.append("ts < ?"); params.append(until)
+    if failed:
+        where.append("ok = 0")
+    keys = [GROUPS[b] for b in by]
+    wall = "CASE WHEN sampled = 1 THEN NULL ELSE wall_ms END"  # tracemalloc-sampled spans run slower
+    timed = "CASE WHEN sampled = 1 OR wall_ms IS NULL THEN NULL ELSE calls END"
+    cols = keys + ["COUNT(*)", "SUM(calls)", "SUM(ok = 0)", f"ROUND(SUM({wall}), 1)",
+                   f"ROUND(SUM({wall}) / SUM({timed}), 2)", "SUM(bytes)"]
+    sql = f"SELECT {', '.join(cols)} FROM events"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    if keys:
+        sql += f" GROUP BY {', '.join(keys)} ORDER BY COUNT(*) DESC"
+    if limit:
+        sql += f" LIMIT {int(limit)}"
+    header = list(by) + ["count", "calls", "failed", "wall_ms", "avg_ms", "bytes"]
+    return header, db.execute(sql, params).fetchall()
+
+def last_plan(db):
+    row = db.execute("SELECT detail FROM events WHERE type = 'plan' ORDER BY id DESC LIMIT 1").fetchone()
+    return json.loads(row[0]) if row else None
+
+def format_table(header, rows):
+    cells = [header] + [["" if v is None else str(v) for v in r] for r in rows]
+    widths = [max(len(r[i]) for r in cells) for i in range(len(header))]
+    return "\n".join("  ".join(c.ljust(w) for c, w in zip(r, widths)).rstrip() for r in cells)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query data/task_log.jsonl (via an incremental SQLite index)")
+    parser.add_argument("--by", type=str, default="type",
+                        help=f"Comma-separated group-by keys: {', '.join(GROUPS)} ('' for totals)")
+    parser.add_argument("--type", type=str, default=None, help="Event type: span, task_result, plan")
+    parser.add_argument("--skill", type=str, default=None)
+    parser.add_argument("--project", type=str, default=None)
+    parser.add_argument("--since", type=str, default=None, help="Window start: 7d, 12h, 30m or ISO date")
+    parser.add_argument("--until", type=str, default=None, help="Window end: same formats as --since")
+    parser.add_argument("--failed", action="store_true", help="Only failed spans")
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--sql", type=str, default=None, help="Run raw SQL against the events table instead")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    db = connect()
+    added = refresh(db)
+    if args.sql:
+        cur = db.execute(args.sql)
+        header, rows = [d[0] for d in cur.description or ()], cur.fetchall()
+    else:
+        by = [b for b in args.by.split(",") if b]
+        unknown = [b for b in by if b not in GROUPS]
+        if unknown:
+            parser.error(f"unknown --by key(s): {', '.join(unknown)}")
+        header, rows = query(db, by, args.type, args.skill, args.project,
+                             parse_time(args.since) if args.since else None,
+                             parse_time(args.until) if args.until else None,
+                             args.failed, args.limit)
+    print(format_table(header, rows))
+    print(f"({len(rows)} row(s); {added} new event(s) indexed; {time.perf_counter()-t0:.3f}s)", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+# scripts/playtest.py
+import argparse, os, random, sys, time
+from collections import deque
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core import assetio, rng
+from core.npcgen import npcs_source, read_npcs
+from runtime.world import TILE, PLAYER_SIZE, World
+from run import load_state, save_state
+
+# Headless playtests: a scripted bot plays each generated level with the viewer's own
+# World (movement, collision, coin pickup, wandering NPCs), walking BFS routes to the
+# nearest remaining coin until none is reachable. Levels run in parallel worker
+# processes; scores land in state.json under "playtest" (keyed by level path), where
+# PlannerAgent can pick the best-scoring level seeds for new runs (run.py --best-seeds).
+
+STUCK_TICKS = 20         # held up this long -> route around the NPCs in the way
+LEG_SLACK = 4            # a coin may take this many times its unobstructed ticks (+ LEG_GRACE)
+LEG_GRACE = 300
+ACTIVE_RADIUS = 8        # only NPCs within this many cells of the bot are simulated
+
+def version(level_path):
+    # what a stored score was computed from; a changed level or NPC file re-runs it
+    npcs = npcs_source(level_path)
+    return [assetio.mtime(level_path), assetio.mtime(npcs) if npcs else 0]
+
+# --- routing on the tile grid ---
+def _neighbours(world, x, y):
+    for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+        if 0 <= nx < world.cols and 0 <= ny < world.rows and (nx, ny) not in world.walls:
+            yield nx, ny
+
+def route(world, start, is_goal, blocked=()):
+    # shortest path [start, ..., goal] to the nearest cell with is_goal(cell), or None
+    prev = {start: None}
+    q = deque([start])
+    while q:
+        c = q.popleft()
+        if is_goal(c):
+            path = []
+            while c is not None:
+                path.append(c)
+                c = prev[c]
+            return path[::-1]
+        for n in _neighbours(world, *c):
+            if n not in prev and n not in blocked:
+                prev[n] = c
+                q.append(n)
+    return None
+
+def dead_ends(world):
+    # open cells with a single way out
+    return sum(1 for y in range(world.rows) for x in range(world.cols)
+               if (x, y) not in world.walls and sum(1 for _ in _neighbours(world, x, y)) == 1)
+
+def _active_npcs(world, r=ACTIVE_RADIUS):
+    # NPCs further away can't reach the bot before it gets closer; skipping them keeps
+    # levels with thousands of NPCs cheap to play
+    p, cells = world.player, world.npc_cells
+    gx, gy = p.centerx // TILE, p.centery // TILE
+    near = [n for y in range(gy - r, gy + r + 1) for x in range(gx - r, gx + r + 1) for n in cells.get((x, y), ())]
+    return sorted(near, key=lambda n: n.id)  # cell buckets are sets: fix the order for reproducible runs
+
+# --- the bot ---
+def play(lvl, npcs_data=(), seed=0):
+    world = World(lvl, npcs_data, rng=random.Random(seed))
+    p, speed = world.player, world.speed
+    off = (TILE - PLAYER_SIZE) // 2
+    cell_ticks = -(-TILE // speed)
+    ticks = path_cells = npc_blocks = reroutes = 0
+    deadlines, given_up = {}, set()
+    has_coin = lambda c: c not in given_up and bool(world.objects.at(c[0], c[1], "coin"))
+    blocked = ()
+    while world.objects.count("coin"):
+        start = (p.centerx // TILE, p.centery // TILE)
+        path = route(world, start, has_coin, blocked) or (route(world, start, has_coin) if blocked else None)
+        if path is None:
+            break
+        blocked, stuck, steps = (), 0, 0
+        # a coin keeps its first deadline across re-routes, so the bot always gives up eventually
+        deadline = deadlines.setdefault(path[-1], ticks + len(path) * cell_ticks * LEG_SLACK + LEG_GRACE)
+        for x, y in path:
+            tx, ty = x * TILE + off, y * TILE + off
+            while p.topleft != (tx, ty):
+                dx, dy = max(-speed, min(speed, tx - p.x)), max(-speed, min(speed, ty - p.y))
+                before = p.topleft
+                world.move_player(dx, dy)
+                world.pickup_coins()
+                world.update_npcs(npcs=_active_npcs(world))
+                ticks += 1
+                if p.topleft != before:
+                    stuck = 0
+                    continue
+                if world.hits_npc(p.move(dx, dy)):
+                    npc_blocks += 1
+                stuck += 1
+                if stuck >= STUCK_TICKS or ticks >= deadline:
+                    break
+            else:
+                steps += 1
+                continue
+            break
+        path_cells += max(0, steps - 1)
+        if p.topleft == (path[-1][0] * TILE + off, path[-1][1] * TILE + off):
+            continue
+        if ticks >= deadline:
+            given_up.add(path[-1])
+        else:
+            reroutes += 1
+            blocked = set(world.npc_cells)
+    total, got = world.coins_total, world.coins_collected
+    moving = path_cells * cell_ticks
+    return {
+        "seed": lvl.get("seed"), "size": [world.cols, world.rows],
+        "coins": total, "collected": got, "completed": world.win,
+        "ticks": ticks, "path_cells": path_cells, "dead_ends": dead_ends(world),
+        "npcs": len(world.npcs), "npc_blocks": npc_blocks, "reroutes": reroutes,
+        # share of coins collected, scaled by how much of the run was spent moving
+        "score": round(got / total * min(1.0, moving / ticks), 4) if total and ticks else 0.0,
+    }
+
+def playtest(level_path):
+    npcs = npcs_source(level_path)
+    ver = version(level_path)
+    lvl = assetio.read_json(level_path)
+    npcs_data = read_npcs(npcs) if npcs and ver[1] else []
+    stats = play(lvl, npcs_data, seed=rng.derive_seed(0, "playtest", os.path.basename(level_path)))
+    stats["version"] = ver
+    return level_path, stats
+
+def _playtest_many(paths):
+    return [playtest(p) for p in paths]
+
+def playtest_all(paths, workers=None):
+    # {level_path: stats}
+    paths = list(paths)
+    if workers == 1 or len(paths) < 16:
+        return dict(_playtest_many(paths))
+    from concurrent.futures import ProcessPoolExecutor
+    workers = workers or os.cpu_count() or 1
+    step = max(4, len(paths) // (workers * 4))
+    batches = [paths[i:i + step] for i in range(0, len(paths), step)]
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        return {p: s for batch in ex.map(_playtest_many, batches) for p, s in batch}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play generated levels with a scripted bot and score them")
+    parser.add_argument("--project", type=str, default=None, help="Only this project's levels (default: all)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Re-run levels whose stored score is current")
+    parser.add_argument("--top", type=int, default=5, help="Print the N best and worst levels")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    scores = load_state().get("playtest", {})
+    paths = assetio.level_paths(args.project)
+    stale = [p for p in paths if args.force or scores.get(p, {}).get("version") != version(p)]
+    results = playtest_all(stale, args.workers)
+    # re-read: run.py or the server may have saved state while the levels were played
+    state = load_state()
+    scores = state.setdefault("playtest", {})
+    scores.update(results)
+    save_state(state)
+
+    ranked = sorted((p for p in paths if p in scores),
+                    key=lambda p: (scores[p]["score"], -scores[p]["ticks"]), reverse=True)
+    done = sum(1 for p in ranked if scores[p]["completed"])
+    print(f"✅ {len(stale)} level(s) played, {len(paths) - len(stale)} up to date; "
+          f"{done}/{len(ranked)} completable ({time.perf_counter()-t0:.2f}s)")
+    n = args.top
+    shown = ranked if len(ranked) <= 2 * n else ranked[:n] + [None] + ranked[len(ranked) - n:] if n else []
+    for p in shown:
+        if p is None:
+            print("  …")
+            continue
+        s = scores[p]
+        print(f"  {s['score']:.3f}  {p}  coins {s['collected']}/{s['coins']}  {s['ticks']} ticks  "
+              f"{s['path_cells']} cells  {s['dead_ends']} dead ends  {s['npc_blocks']} npc blocks  seed {s['seed']}")
+
+if __name__ == "__main__":
+    main()
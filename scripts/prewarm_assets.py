@@ -0,0 +1,20 @@
+# scripts/prewarm_assets.py
+import argparse, os, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from runtime.assets import CACHE_DIR, prewarm, project_assets
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile generated JSON assets into the viewer's asset cache")
+    parser.add_argument("--project", type=str, default=None, help="Only this project's assets (default: all)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    paths = project_assets(args.project)
+    compiled, fresh = prewarm(paths, workers=args.workers)
+    print(f"✅ Prewarmed {len(paths)} asset(s) into {CACHE_DIR}: "
+          f"{len(compiled)} compiled, {len(fresh)} already fresh ({time.perf_counter()-t0:.2f}s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+# scripts/render_thumbnails.py
+import argparse, os, sys, time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import numpy as np
+import pygame
+from core import assetio
+from core.npcgen import npcs_source, read_npcs
+
+# Level previews without the viewer: tiles, objects and NPC positions are painted straight
+# into NumPy arrays (one pixel block per cell), saved as PNG thumbnails and optionally
+# tiled into contact sheets. Levels render in parallel; up-to-date thumbnails are skipped.
+
+OUT_DIR = os.path.join("data", "thumbnails")
+
+FLOOR, WALL, COIN, SIGN, NPC, SPAWN = (
+    (24, 24, 24), (90, 90, 90), (220, 200, 40), (0, 150, 200), (200, 80, 80), (220, 220, 220))
+PALETTE = np.zeros((256, 3), dtype=np.uint8)
+PALETTE[:] = FLOOR
+PALETTE[ord("#")] = WALL
+OBJECT_COLORS = {"coin": COIN, "sign": SIGN}
+
+_npc_cache = {}  # per worker: NPC file -> (mtime, int array of [x, y])
+
+def thumb_path(level_path, out_dir=OUT_DIR):
+    name = os.path.basename(level_path)[:-len(".json")]
+    return os.path.join(out_dir, name + ".png")
+
+def _npc_cells(path):
+    if path is None:
+        return np.zeros((0, 2), dtype=np.int64)
+    mt = assetio.mtime(path)
+    hit = _npc_cache.get(path)
+    if hit is None or hit[0] != mt:
+        cells = [(n["x"], n["y"]) for n in read_npcs(path)] if mt else []
+        hit = _npc_cache[path] = (mt, np.array(cells, dtype=np.int64).reshape(-1, 2))
+    return hit[1]
+
+def is_fresh(level_path, out_dir=OUT_DIR):
+    # thumbnail newer than the level (and the NPC file painted onto it)
+    t = assetio.mtime(thumb_path(level_path, out_dir))
+    npcs = npcs_source(level_path)
+    return t > 0 and t >= assetio.mtime(level_path) and (npcs is None or t >= assetio.mtime(npcs))
+
+def paint(lvl, npc_cells, size):
+    # (h, w, 3) uint8 image that fits in size x size
+    rows = [r if isinstance(r, str) else "".join(r) for r in lvl["tiles"]]
+    h, w = len(rows), len(rows[0])
+    grid = np.frombuffer("".join(rows).encode("latin-1", "replace"), dtype=np.uint8).reshape(h, w)
+    scale = min(size / w, size / h)
+    oh, ow = max(1, int(h * scale)), max(1, int(w * scale))
+    # nearest-cell sampling scales up (blocks) and down (skips cells) alike
+    iy = np.minimum((np.arange(oh) / scale).astype(np.int64), h - 1)
+    ix = np.minimum((np.arange(ow) / scale).astype(np.int64), w - 1)
+    img = PALETTE[grid[iy[:, None], ix[None, :]]]
+
+    # markers are painted after scaling so small ones survive downsampling
+    k = max(1, int(scale))
+    def mark(cells, color):
+        if not len(cells):
+            return
+        cells = cells[(cells[:, 0] >= 0) & (cells[:, 0] < w) & (cells[:, 1] >= 0) & (cells[:, 1] < h)]
+        px = np.minimum((cells[:, 0] * scale).astype(np.int64), ow - 1)
+        py = np.minimum((cells[:, 1] * scale).astype(np.int64), oh - 1)
+        for dy in range(k):
+            for dx in range(k):
+                img[np.minimum(py + dy, oh - 1), np.minimum(px + dx, ow - 1)] = color
+
+    objects = lvl.get("objects", [])
+    for kind, color in OBJECT_COLORS.items():
+        mark(np.array([(o["x"], o["y"]) for o in objects if o["type"] == kind], dtype=np.int64).reshape(-1, 2), color)
+    mark(npc_cells, NPC)
+    mark(np.array([lvl.get("player_spawn", [1, 1])], dtype=np.int64), SPAWN)
+    return img
+
+def save_png(img, path):
+    surf = pygame.surfarray.make_surface(np.ascontiguousarray(img.swapaxes(0, 1)))
+    tmp = f"{path[:-4]}.{os.getpid()}.tmp.png"
+    pygame.image.save(surf, tmp)
+    os.replace(tmp, path)
+
+def render(level_path, size=128, out_dir=OUT_DIR, force=False):
+    # returns (level_path, rendered?)
+    if not force and is_fresh(level_path, out_dir):
+        return level_path, False
+    lvl = assetio.read_json(level_path)
+    save_png(paint(lvl, _npc_cells(npcs_source(level_path)), size), thumb_path(level_path, out_dir))
+    return level_path, True
+
+def _render_many(args):
+    paths, size, out_dir, force = args
+    return [render(p, size, out_dir, force) for p in paths]
+
+def render_all(paths, size=128, out_dir=OUT_DIR, workers=None, force=False):
+    # returns (rendered, skipped)
+    os.makedirs(out_dir, exist_ok=True)
+    paths = list(paths)
+    if workers == 1 or len(paths) < 64:
+        results = _render_many((paths, size, out_dir, force))
+    else:
+        # contiguous batches of the sorted paths: few NPC files are loaded per worker
+        from concurrent.futures import ProcessPoolExecutor
+        workers = workers or os.cpu_count() or 1
+        step = max(16, len(paths) // (workers * 4))
+        batches = [(paths[i:i + step], size, out_dir, force) for i in range(0, len(paths), step)]
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            results = [r for batch in ex.map(_render_many, batches) for r in batch]
+    return [p for p, r in results if r], [p for p, r in results if not r]
+
+def contact_sheets(paths, size=128, cols=8, rows=6, out_dir=OUT_DIR):
+    # pages of labelled thumbnails: sheet_000.png, sheet_001.png, ...
+    pygame.font.init()
+    font = pygame.font.SysFont(None, 16)
+    label_h, pad = 16, 4
+    cw, ch = size + pad, size + label_h + pad
+    per_page = cols * rows
+    sheets = []
+    for page in range(0, len(paths), per_page):
+        chunk = paths[page:page + per_page]
+        n_rows = (len(chunk) + cols - 1) // cols
+        sheet = pygame.Surface((cols * cw + pad, n_rows * ch + pad))
+        sheet.fill((12, 12, 12))
+        for i, p in enumerate(chunk):
+            x, y = pad + (i % cols) * cw, pad + (i // cols) * ch
+            thumb = pygame.image.load(thumb_path(p, out_dir))
+            sheet.blit(thumb, (x + (size - thumb.get_width()) // 2, y + (size - thumb.get_height()) // 2))
+            name = os.path.basename(p)[:-len(".json")]
+            sheet.blit(font.render(name, True, (200, 200, 200)), (x, y + size + 1),
+                       pygame.Rect(0, 0, size, label_h))
+        out = os.path.join(out_dir, f"sheet_{page // per_page:03d}.png")
+        pygame.image.save(sheet, out)
+        sheets.append(out)
+    return sheets
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render PNG thumbnails and contact sheets of generated levels")
+    parser.add_argument("--project", type=str, default=None, help="Only this project's levels (default: all)")
+    parser.add_argument("--size", type=int, default=128, help="Thumbnail box in pixels")
+    parser.add_argument("--out", type=str, default=OUT_DIR, help="Output directory")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Re-render even up-to-date thumbnails")
+    parser.add_argument("--sheet", action="store_true", help="Also write contact sheets")
+    parser.add_argument("--cols", type=int, default=8, help="Contact sheet columns")
+    parser.add_argument("--rows", type=int, default=6, help="Contact sheet rows per page")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    paths = assetio.level_paths(args.project)
+    rendered, skipped = render_all(paths, args.size, args.out, args.workers, args.force)
+    print(f"✅ {len(rendered)} thumbnail(s) rendered, {len(skipped)} up to date in {args.out} "
+          f"({time.perf_counter()-t0:.2f}s)")
+    if args.sheet and paths:
+        sheets = contact_sheets(paths, args.size, args.cols, args.rows, args.out)
+        print(f"✅ {len(sheets)} contact sheet(s): {sheets[0]}{' …' if len(sheets) > 1 else ''}")
+
+if __name__ == "__main__":
+    main()